@@ -1,8 +1,24 @@
+from collections import OrderedDict
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-from collections import deque
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.ticker import MaxNLocator
+
+import gantt
+import instrument
+import scheduler
+from incremental import IncrementalSimulation
+from result_cache import ResultCache, cache_key
+from process_table import ProcessTable
+from smp import simulate_smp
+from table_view import VirtualTable
+import workload
+
+# Number of rendered Gantt figures kept for cached results
+GANTT_FIGURE_CACHE_SIZE = 8
 
 class CPUSchedulingSimulator:
     def __init__(self, root):
@@ -10,9 +26,27 @@ class CPUSchedulingSimulator:
         self.root.title("CPU Scheduling Simulator")
         self.root.geometry("1000x700")
         
-        self.processes = []
+        self.processes = ProcessTable()
+        self.pid_index = {}  # PID -> row in self.processes
         self.current_algorithm = "FCFS"
         self.gantt_chart_data = []
+        self.results = ProcessTable()
+        self.metrics = {}
+        
+        # Background simulation state
+        self.sim_thread = None
+        self.sim_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        
+        # Incremental re-simulation state: the earliest arrival time touched
+        # by add/delete since the last run is replayed from
+        self.incremental = IncrementalSimulation()
+        self.changed_from = None
+        
+        # Results and Gantt figures of earlier runs, so switching back to a
+        # configuration that was already simulated is instant
+        self.result_cache = ResultCache()
+        self.gantt_figures = OrderedDict()
         
         self.create_widgets()
         self.create_sample_data()
@@ -43,24 +77,29 @@ class CPUSchedulingSimulator:
         self.priority_entry.grid(row=1, column=3, padx=5, pady=2)
         
         # Add process button
-        add_btn = ttk.Button(left_frame, text="+ Add Process", command=self.add_process)
-        add_btn.grid(row=1, column=4, padx=5, pady=2)
-        
-        # Process table
-        self.process_table = ttk.Treeview(left_frame, columns=("pid", "arrival", "burst", "priority"), show="headings")
-        self.process_table.heading("pid", text="Process ID")
-        self.process_table.heading("arrival", text="Arrival Time")
-        self.process_table.heading("burst", text="Burst Time")
-        self.process_table.heading("priority", text="Priority")
-        self.process_table.column("pid", width=80)
-        self.process_table.column("arrival", width=80)
-        self.process_table.column("burst", width=80)
-        self.process_table.column("priority", width=80)
-        self.process_table.grid(row=2, column=0, columnspan=5, pady=10, sticky="nsew")
-        
-        # Delete process button
-        del_btn = ttk.Button(left_frame, text="Delete Selected", command=self.delete_process)
-        del_btn.grid(row=3, column=0, columnspan=5, pady=5)
+        self.add_btn = ttk.Button(left_frame, text="+ Add Process", command=self.add_process)
+        self.add_btn.grid(row=1, column=4, padx=5, pady=2)
+        
+        # Process table - only the visible page of rows is in the widget
+        self.process_view = VirtualTable(left_frame, ("pid", "arrival", "burst", "priority"),
+                                         ("Process ID", "Arrival Time", "Burst Time", "Priority"))
+        self.process_view.frame.grid(row=2, column=0, columnspan=5, pady=10, sticky="nsew")
+        
+        # Delete process button, and a generator for large random workloads
+        list_frame = ttk.Frame(left_frame)
+        list_frame.grid(row=3, column=0, columnspan=5, pady=5)
+        self.del_btn = ttk.Button(list_frame, text="Delete Selected", command=self.delete_process)
+        self.del_btn.pack(side=tk.LEFT, padx=5)
+        ttk.Label(list_frame, text="Random Processes:").pack(side=tk.LEFT)
+        self.generate_entry = ttk.Entry(list_frame, width=8)
+        self.generate_entry.pack(side=tk.LEFT, padx=5)
+        self.generate_entry.insert(0, "1000")
+        ttk.Label(list_frame, text="Seed:").pack(side=tk.LEFT)
+        self.seed_entry = ttk.Entry(list_frame, width=5)
+        self.seed_entry.pack(side=tk.LEFT, padx=5)
+        self.seed_entry.insert(0, "0")
+        self.generate_btn = ttk.Button(list_frame, text="Generate", command=self.generate_processes)
+        self.generate_btn.pack(side=tk.LEFT, padx=5)
         
         # Algorithm selection
         algo_frame = ttk.LabelFrame(left_frame, text="Scheduling Algorithm", padding="10")
@@ -72,7 +111,9 @@ class CPUSchedulingSimulator:
             ("Shortest Job First (SJF)", "SJF"),
             ("Shortest Remaining Time First (SRTF)", "SRTF"),
             ("Priority Scheduling", "Priority"),
-            ("Round Robin (RR)", "RR")
+            ("Round Robin (RR)", "RR"),
+            ("Multilevel Feedback Queue (MLFQ)", "MLFQ"),
+            ("Completely Fair Scheduler (CFS)", "CFS")
         ]
         
         for i, (text, algo) in enumerate(algorithms):
@@ -81,19 +122,47 @@ class CPUSchedulingSimulator:
         
         # For Round Robin, add quantum input
         self.quantum_frame = ttk.Frame(algo_frame)
-        self.quantum_frame.grid(row=2, column=1, sticky="w")
+        self.quantum_frame.grid(row=3, column=1, sticky="w")
         ttk.Label(self.quantum_frame, text="Time Quantum:").pack(side=tk.LEFT)
         self.quantum_entry = ttk.Entry(self.quantum_frame, width=5)
         self.quantum_entry.pack(side=tk.LEFT, padx=5)
         self.quantum_entry.insert(0, "2")
         self.quantum_frame.grid_remove()  # Hide initially
         
-        # Show quantum input only when RR is selected
+        # Show quantum input only for the algorithms that take one
         self.algo_var.trace_add("write", self.toggle_quantum_input)
         
+        # Number of CPUs, and whether each CPU has its own ready queue
+        cpu_frame = ttk.Frame(algo_frame)
+        cpu_frame.grid(row=4, column=0, columnspan=2, sticky="w")
+        ttk.Label(cpu_frame, text="CPUs:").pack(side=tk.LEFT)
+        self.cpus_entry = ttk.Entry(cpu_frame, width=5)
+        self.cpus_entry.pack(side=tk.LEFT, padx=5)
+        self.cpus_entry.insert(0, "1")
+        self.per_core_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(cpu_frame, text="Per-core queues with work stealing",
+                        variable=self.per_core_var).pack(side=tk.LEFT, padx=5)
+        
+        # Time lost on every context switch
+        switch_frame = ttk.Frame(algo_frame)
+        switch_frame.grid(row=5, column=0, columnspan=2, sticky="w")
+        ttk.Label(switch_frame, text="Context Switch Cost:").pack(side=tk.LEFT)
+        self.switch_cost_entry = ttk.Entry(switch_frame, width=5)
+        self.switch_cost_entry.pack(side=tk.LEFT, padx=5)
+        self.switch_cost_entry.insert(0, "0")
+        
         # Simulate button
-        simulate_btn = ttk.Button(left_frame, text="Simulate", command=self.simulate)
-        simulate_btn.grid(row=5, column=0, columnspan=5, pady=10)
+        self.simulate_btn = ttk.Button(left_frame, text="Simulate", command=self.simulate)
+        self.simulate_btn.grid(row=5, column=0, columnspan=5, pady=10)
+        
+        # Progress bar and Cancel button, shown while a simulation runs
+        self.progress_frame = ttk.Frame(left_frame)
+        self.progress_frame.grid(row=6, column=0, columnspan=5, sticky="ew")
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.cancel_btn = ttk.Button(self.progress_frame, text="Cancel", command=self.cancel_simulation)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        self.progress_frame.grid_remove()  # Hide initially
         
         # Right panel - Results
         right_frame = ttk.Frame(main_frame, padding="10")
@@ -116,27 +185,20 @@ class CPUSchedulingSimulator:
         self.avg_wt_label = ttk.Label(results_frame, text="Average Waiting Time: ")
         self.avg_wt_label.pack(anchor="w")
         
-        # Detailed results table
-        self.results_table = ttk.Treeview(
-            right_frame, 
-            columns=("pid", "arrival", "burst", "priority", "completion", "waiting", "turnaround"), 
-            show="headings"
-        )
-        self.results_table.heading("pid", text="Process ID")
-        self.results_table.heading("arrival", text="Arrival Time")
-        self.results_table.heading("burst", text="Burst Time")
-        self.results_table.heading("priority", text="Priority")
-        self.results_table.heading("completion", text="Completion Time")
-        self.results_table.heading("waiting", text="Waiting Time")
-        self.results_table.heading("turnaround", text="Turnaround Time")
-        
-        for col in ("pid", "arrival", "burst", "priority", "completion", "waiting", "turnaround"):
-            self.results_table.column(col, width=80, anchor="center")
+        self.overhead_label = ttk.Label(results_frame, text="")
+        self.overhead_label.pack(anchor="w")
         
-        self.results_table.pack(fill=tk.BOTH, expand=True)
+        # Detailed results table, virtualized like the process table
+        self.results_view = VirtualTable(
+            right_frame,
+            ("pid", "arrival", "burst", "priority", "completion", "waiting", "turnaround"),
+            ("Process ID", "Arrival Time", "Burst Time", "Priority", "Completion Time",
+             "Waiting Time", "Turnaround Time")
+        )
+        self.results_view.frame.pack(fill=tk.BOTH, expand=True)
         
     def toggle_quantum_input(self, *args):
-        if self.algo_var.get() == "RR":
+        if self.algo_var.get() in scheduler.QUANTUM_ALGORITHMS:
             self.quantum_frame.grid()
         else:
             self.quantum_frame.grid_remove()
@@ -149,14 +211,9 @@ class CPUSchedulingSimulator:
         ]
         
         for pid, arrival, burst, priority in sample_data:
-            self.process_table.insert("", tk.END, values=(pid, arrival, burst, priority))
-            self.processes.append({
-                "pid": pid,
-                "arrival": arrival,
-                "burst": burst,
-                "priority": priority,
-                "remaining": burst
-            })
+            self.pid_index[pid] = len(self.processes)
+            self.processes.append(pid, arrival, burst, priority)
+        self.process_view.set_source(self.processes)
     
     def add_process(self):
         try:
@@ -170,19 +227,14 @@ class CPUSchedulingSimulator:
                 return
                 
             # Check if PID already exists
-            for item in self.process_table.get_children():
-                if self.process_table.item(item)["values"][0] == pid:
-                    messagebox.showerror("Error", "Process ID must be unique")
-                    return
+            if pid in self.pid_index:
+                messagebox.showerror("Error", "Process ID must be unique")
+                return
             
-            self.process_table.insert("", tk.END, values=(pid, arrival, burst, priority))
-            self.processes.append({
-                "pid": pid,
-                "arrival": arrival,
-                "burst": burst,
-                "priority": priority,
-                "remaining": burst
-            })
+            self.pid_index[pid] = len(self.processes)
+            self.processes.append(pid, arrival, burst, priority)
+            self.process_view.refresh()
+            self.mark_changed(arrival)
             
             # Clear entries
             self.pid_entry.delete(0, tk.END)
@@ -194,16 +246,40 @@ class CPUSchedulingSimulator:
             messagebox.showerror("Error", "Please enter valid numbers for all fields")
     
     def delete_process(self):
-        selected = self.process_table.selection()
-        if not selected:
+        rows = self.process_view.selected_rows()
+        if not rows:
             return
             
-        for item in selected:
-            pid = self.process_table.item(item)["values"][0]
-            self.process_table.delete(item)
-            
-            # Remove from processes list
-            self.processes = [p for p in self.processes if p["pid"] != pid]
+        pids = []
+        for i in rows:
+            pids.append(self.processes.pid[i])
+            self.mark_changed(self.processes.arrival[i])
+        
+        # Remove from processes table in one pass, then renumber the rows
+        self.processes.delete(pids)
+        self.pid_index = {pid: i for i, pid in enumerate(self.processes.pid)}
+        self.process_view.refresh()
+    
+    def generate_processes(self):
+        try:
+            size = int(self.generate_entry.get())
+            seed = int(self.seed_entry.get())
+            if size <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a positive number of processes and an integer seed")
+            return
+        
+        # Replace the process list; the old schedule can't be replayed from
+        self.processes = workload.generate(size, seed=seed)
+        self.pid_index = {pid: i for i, pid in enumerate(self.processes.pid)}
+        self.process_view.set_source(self.processes)
+        self.changed_from = None
+        self.incremental.reset()
+    
+    def mark_changed(self, arrival):
+        if self.changed_from is None or arrival < self.changed_from:
+            self.changed_from = arrival
     
     def simulate(self):
         if not self.processes:
@@ -212,13 +288,12 @@ class CPUSchedulingSimulator:
             
         # Clear previous results
         self.gantt_chart_data = []
-        for item in self.results_table.get_children():
-            self.results_table.delete(item)
+        self.results_view.clear()
         
-        # Get algorithm and quantum if RR
+        # Get algorithm and quantum if it takes one
         algorithm = self.algo_var.get()
         quantum = 2  # default
-        if algorithm == "RR":
+        if algorithm in scheduler.QUANTUM_ALGORITHMS:
             try:
                 quantum = int(self.quantum_entry.get())
                 if quantum <= 0:
@@ -227,290 +302,213 @@ class CPUSchedulingSimulator:
                 messagebox.showerror("Error", "Please enter a valid positive integer for quantum")
                 return
         
-        # Reset remaining time for all processes
-        for process in self.processes:
-            process["remaining"] = process["burst"]
-            process["completion"] = 0
-            process["waiting"] = 0
-            process["turnaround"] = 0
-        
-        # Run the selected algorithm
-        if algorithm == "FCFS":
-            self.run_fcfs()
-        elif algorithm == "SJF":
-            self.run_sjf()
-        elif algorithm == "SRTF":
-            self.run_srtf()
-        elif algorithm == "Priority":
-            self.run_priority()
-        elif algorithm == "RR":
-            self.run_rr(quantum)
-        
-        # Calculate metrics and display results
-        self.calculate_metrics()
-        self.display_results()
-        self.draw_gantt_chart()
-    
-    def run_fcfs(self):
-        # Sort processes by arrival time
-        ready_queue = sorted(self.processes, key=lambda x: x["arrival"])
-        current_time = 0
-        
-        for process in ready_queue:
-            if current_time < process["arrival"]:
-                current_time = process["arrival"]
-            
-            # Record start and end times for Gantt chart
-            start_time = current_time
-            end_time = current_time + process["burst"]
-            self.gantt_chart_data.append({
-                "pid": process["pid"],
-                "start": start_time,
-                "end": end_time
-            })
-            
-            # Update process completion time
-            process["completion"] = end_time
-            current_time = end_time
+        try:
+            cpus = int(self.cpus_entry.get())
+            if cpus <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid positive integer for CPUs")
+            return
+        
+        try:
+            switch_cost = int(self.switch_cost_entry.get())
+            if switch_cost < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a non-negative integer for context switch cost")
+            return
+        if (cpus > 1 or switch_cost) and algorithm not in scheduler.CLASSIC_ALGORITHMS:
+            messagebox.showerror("Error", f"{algorithm} can only be simulated on 1 CPU "
+                                          "without context switch cost")
+            return
+        per_core = self.per_core_var.get()
+        
+        # Run the selected algorithm on the headless engine in a worker
+        # thread; results come back through sim_queue to poll_simulation
+        self.cancel_event.clear()
+        self.progress_bar.config(maximum=len(self.processes), value=0)
+        self.progress_frame.grid()
+        self.set_editing(tk.DISABLED)
+        self.sim_thread = threading.Thread(
+            target=self.run_simulation,
+            args=(self.processes.copy(), algorithm, quantum, cpus, per_core, switch_cost,
+                  self.changed_from),
+            daemon=True)
+        self.changed_from = None
+        self.sim_thread.start()
+        self.root.after(50, self.poll_simulation)
     
-    def run_sjf(self):
-        ready_queue = []
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        
-        while completed < n:
-            # Add arrived processes to ready queue
-            for p in self.processes:
-                if p["arrival"] <= current_time and p["remaining"] > 0 and p not in ready_queue:
-                    ready_queue.append(p)
-            
-            if not ready_queue:
-                current_time += 1
-                continue
-                
-            # Sort by remaining burst time
-            ready_queue.sort(key=lambda x: x["remaining"])
-            process = ready_queue[0]
-            
-            # Record start and end times for Gantt chart
-            start_time = current_time
-            end_time = current_time + process["remaining"]
-            self.gantt_chart_data.append({
-                "pid": process["pid"],
-                "start": start_time,
-                "end": end_time
-            })
-            
-            # Update process completion time
-            process["completion"] = end_time
-            process["remaining"] = 0
-            current_time = end_time
-            completed += 1
-            ready_queue.pop(0)
+    def run_simulation(self, processes, algorithm, quantum, cpus, per_core, switch_cost,
+                       changed_from):
+        # Runs on the worker thread - must not touch any Tk widget
+        def progress(completed, total):
+            if self.cancel_event.is_set():
+                raise scheduler.Cancelled
+            self.sim_queue.put(("progress", completed))
+        
+        try:
+            key = cache_key(processes, algorithm, quantum, cpus, per_core, switch_cost)
+            result = self.result_cache.get(key)
+            if result is not None or cpus > 1 or switch_cost:
+                # Keep the incremental state aware of edits it has not seen
+                self.incremental.invalidate(changed_from)
+            if result is None:
+                if cpus > 1 or switch_cost:
+                    result = simulate_smp(processes, algorithm, quantum, cpus, per_core,
+                                          progress=progress, switch_cost=switch_cost)
+                else:
+                    result = self.incremental.simulate(processes, algorithm, quantum,
+                                                       changed_from, progress)
+                self.result_cache.put(key, result)
+            self.sim_queue.put(("done", (key, result)))
+        except scheduler.Cancelled:
+            self.sim_queue.put(("cancelled", None))
+        except Exception as e:
+            self.sim_queue.put(("error", e))
     
-    def run_srtf(self):
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        prev_process = None
-        
-        while completed < n:
-            # Find process with shortest remaining time that has arrived
-            min_remaining = float('inf')
-            selected_process = None
-            
-            for p in self.processes:
-                if p["arrival"] <= current_time and p["remaining"] > 0:
-                    if p["remaining"] < min_remaining:
-                        min_remaining = p["remaining"]
-                        selected_process = p
+    def poll_simulation(self):
+        # Drain worker messages on the Tk main thread
+        while True:
+            try:
+                kind, payload = self.sim_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            if not selected_process:
-                current_time += 1
+            if kind == "progress":
+                self.progress_bar.config(value=payload)
                 continue
-                
-            # If process changed, record the previous process's execution
-            if prev_process and prev_process["pid"] != selected_process["pid"]:
-                self.gantt_chart_data[-1]["end"] = current_time
-            
-            # If no previous process or process changed, add new entry
-            if not prev_process or prev_process["pid"] != selected_process["pid"]:
-                self.gantt_chart_data.append({
-                    "pid": selected_process["pid"],
-                    "start": current_time,
-                    "end": current_time + 1  # Will be updated next cycle
-                })
-            
-            # Execute for 1 unit of time
-            selected_process["remaining"] -= 1
-            current_time += 1
-            prev_process = selected_process
             
-            # If process completed
-            if selected_process["remaining"] == 0:
-                selected_process["completion"] = current_time
-                completed += 1
-                # Update the end time in Gantt chart
-                self.gantt_chart_data[-1]["end"] = current_time
-                prev_process = None
+            self.finish_simulation()
+            if kind == "done":
+                key, (self.results, self.gantt_chart_data, metrics) = payload
+                self.avg_waiting = metrics["avg_waiting"]
+                self.avg_turnaround = metrics["avg_turnaround"]
+                self.metrics = metrics
+                with instrument.phase("display_results"):
+                    self.display_results()
+                with instrument.phase("draw_gantt_chart"):
+                    self.draw_gantt_chart(key)
+            elif kind == "error":
+                messagebox.showerror("Error", f"Simulation failed: {payload}")
+            return
+        
+        self.root.after(50, self.poll_simulation)
     
-    def run_priority(self):
-        ready_queue = []
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        
-        while completed < n:
-            # Add arrived processes to ready queue
-            for p in self.processes:
-                if p["arrival"] <= current_time and p["remaining"] > 0 and p not in ready_queue:
-                    ready_queue.append(p)
-            
-            if not ready_queue:
-                current_time += 1
-                continue
-                
-            # Sort by priority (lower number = higher priority)
-            ready_queue.sort(key=lambda x: x["priority"])
-            process = ready_queue[0]
-            
-            # Record start and end times for Gantt chart
-            start_time = current_time
-            end_time = current_time + process["remaining"]
-            self.gantt_chart_data.append({
-                "pid": process["pid"],
-                "start": start_time,
-                "end": end_time
-            })
-            
-            # Update process completion time
-            process["completion"] = end_time
-            process["remaining"] = 0
-            current_time = end_time
-            completed += 1
-            ready_queue.pop(0)
+    def cancel_simulation(self):
+        self.cancel_event.set()
     
-    def run_rr(self, quantum):
-        ready_queue = deque()
-        current_time = 0
-        completed = 0
-        n = len(self.processes)
-        time_slice = quantum
-        
-        # Sort processes by arrival time initially
-        processes_sorted = sorted(self.processes, key=lambda x: x["arrival"])
-        i = 0
-        
-        while completed < n:
-            # Add arrived processes to ready queue
-            while i < n and processes_sorted[i]["arrival"] <= current_time:
-                ready_queue.append(processes_sorted[i])
-                i += 1
-            
-            if not ready_queue:
-                current_time += 1
-                continue
-                
-            process = ready_queue.popleft()
-            
-            # Determine execution time (minimum of quantum or remaining time)
-            exec_time = min(time_slice, process["remaining"])
-            
-            # Record start and end times for Gantt chart
-            start_time = current_time
-            end_time = current_time + exec_time
-            self.gantt_chart_data.append({
-                "pid": process["pid"],
-                "start": start_time,
-                "end": end_time
-            })
-            
-            # Update process remaining time
-            process["remaining"] -= exec_time
-            current_time = end_time
-            
-            # If process completed
-            if process["remaining"] == 0:
-                process["completion"] = current_time
-                completed += 1
-            else:
-                # Add arrived processes while this process was executing
-                while i < n and processes_sorted[i]["arrival"] <= current_time:
-                    ready_queue.append(processes_sorted[i])
-                    i += 1
-                # Add the current process back to queue
-                ready_queue.append(process)
+    def finish_simulation(self):
+        self.sim_thread = None
+        self.progress_frame.grid_remove()
+        self.set_editing(tk.NORMAL)
     
-    def calculate_metrics(self):
-        total_waiting = 0
-        total_turnaround = 0
-        
-        for process in self.processes:
-            process["turnaround"] = process["completion"] - process["arrival"]
-            process["waiting"] = process["turnaround"] - process["burst"]
-            total_waiting += process["waiting"]
-            total_turnaround += process["turnaround"]
-        
-        self.avg_waiting = total_waiting / len(self.processes)
-        self.avg_turnaround = total_turnaround / len(self.processes)
+    def set_editing(self, state):
+        # The process list and the incremental state can't change under a
+        # running simulation
+        for button in (self.simulate_btn, self.add_btn, self.del_btn, self.generate_btn):
+            button.config(state=state)
     
     def display_results(self):
         self.avg_tat_label.config(text=f"Average Turnaround Time: {self.avg_turnaround:.2f}")
         self.avg_wt_label.config(text=f"Average Waiting Time: {self.avg_waiting:.2f}")
+        if "lost_utilization" in self.metrics:
+            self.overhead_label.config(
+                text=f"Context Switches: {self.metrics['switches']} "
+                     f"(CPU Utilization: {self.metrics['utilization']:.1%}, "
+                     f"{self.metrics['lost_utilization']:.1%} lost to switching)")
+        else:
+            self.overhead_label.config(text="")
         
-        for process in sorted(self.processes, key=lambda x: x["pid"]):
-            self.results_table.insert("", tk.END, values=(
-                process["pid"],
-                process["arrival"],
-                process["burst"],
-                process["priority"],
-                process["completion"],
-                process["waiting"],
-                process["turnaround"]
-            ))
+        self.results_view.set_source(self.results)
     
-    def draw_gantt_chart(self):
+    def draw_gantt_chart(self, key=None):
         # Clear previous chart
         for widget in self.gantt_canvas_frame.winfo_children():
             widget.destroy()
         
         if not self.gantt_chart_data:
             return
-            
-        # Create figure
-        fig, ax = plt.subplots(figsize=(10, 2))
-        fig.subplots_adjust(bottom=0.3)
         
-        # Get unique process IDs for coloring
-        unique_pids = list(set([item["pid"] for item in self.gantt_chart_data]))
-        colors = plt.cm.tab10.colors[:len(unique_pids)]
-        pid_to_color = {pid: colors[i] for i, pid in enumerate(unique_pids)}
+        # Reuse the figure of a cached result, keeping the last few around
+        fig = self.gantt_figures.get(key) if key is not None else None
+        if fig is None:
+            with instrument.phase("create_gantt_figure"):
+                fig = self.create_gantt_figure()
+            if key is not None:
+                self.gantt_figures[key] = fig
+                while len(self.gantt_figures) > GANTT_FIGURE_CACHE_SIZE:
+                    plt.close(self.gantt_figures.popitem(last=False)[1])
+        else:
+            self.gantt_figures.move_to_end(key)
         
-        # Draw bars
+        # Embed in Tkinter
+        canvas = FigureCanvasTkAgg(fig, master=self.gantt_canvas_frame)
+        with instrument.phase("render"):
+            canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    def create_gantt_figure(self):
+        # One lane per CPU for multi-core schedules
+        lanes = {}
         for item in self.gantt_chart_data:
-            duration = item["end"] - item["start"]
-            ax.broken_barh([(item["start"], duration)], (0, 1), 
-                          facecolors=pid_to_color[item["pid"]], 
-                          edgecolor='black')
-            # Add label in the middle of the bar
-            ax.text(item["start"] + duration/2, 0.5, f"P{item['pid']}", 
-                   ha='center', va='center', color='white')
-        
-        # Set axes and ticks
-        ax.set_yticks([])
+            lanes.setdefault(item.get("cpu", 0), []).append(item)
+        
+        # Create figure
+        fig, ax = plt.subplots(figsize=(10, 2 if len(lanes) == 1 else min(2 + 0.25 * len(lanes), 8)))
+        fig.subplots_adjust(bottom=0.3 if len(lanes) == 1 else 0.15)
+        
+        # Merge back-to-back runs and reduce to at most one segment per pixel
+        start = self.gantt_chart_data[0]["start"]
+        end = max(item["end"] for item in self.gantt_chart_data)
+        pixel_width = max(int(ax.bbox.width), 1)
+        lane_segments = {cpu: gantt.downsample_segments(items, pixel_width, start, end)
+                         for cpu, items in lanes.items()}
+        segment_count = sum(len(segments) for segments in lane_segments.values())
+        
+        # Get unique process IDs for coloring
+        unique_pids = sorted(set(item["pid"] for segments in lane_segments.values() for item in segments))
+        colors = plt.cm.tab10.colors
+        pid_to_color = {pid: colors[i % len(colors)] for i, pid in enumerate(unique_pids)}
+        
+        edgecolor = 'black' if segment_count <= 100 else 'none'
+        min_label_width = (end - start) * 30 / pixel_width
+        for cpu, segments in lane_segments.items():
+            # Draw bars - one broken_barh call per color instead of per segment
+            bars = {}
+            for item in segments:
+                bars.setdefault(pid_to_color[item["pid"]], []).append((item["start"], item["end"] - item["start"]))
+            for color, spans in bars.items():
+                ax.broken_barh(spans, (cpu, 1), facecolors=color, edgecolor=edgecolor)
+            
+            # Add labels in the middle of bars wide enough to read (~30 px)
+            for item in segments:
+                duration = item["end"] - item["start"]
+                if duration >= min_label_width or segment_count <= 10:
+                    ax.text(item["start"] + duration/2, cpu + 0.5, f"P{item['pid']}", 
+                           ha='center', va='center', color='white', clip_on=True)
+        
+        # Set axes and ticks - one tick per time unit only on short charts
+        if len(lanes) == 1:
+            ax.set_yticks([])
+        else:
+            cpus = sorted(lanes)
+            step = max(1, len(cpus) // 16)
+            ax.set_yticks([cpu + 0.5 for cpu in cpus[::step]])
+            ax.set_yticklabels([f"CPU {cpu}" for cpu in cpus[::step]])
+            ax.invert_yaxis()
         ax.set_xlabel("Time")
-        ax.set_xticks(range(int(self.gantt_chart_data[-1]["end"]) + 1))
+        if end <= 30:
+            ax.set_xticks(range(int(end) + 1))
+        else:
+            ax.xaxis.set_major_locator(MaxNLocator(integer=True))
         ax.grid(True, axis='x')
         
-        # Create legend
-        patches = [plt.Rectangle((0,0),1,1, fc=pid_to_color[pid]) for pid in unique_pids]
-        ax.legend(patches, [f"P{pid}" for pid in unique_pids], loc='upper right')
+        # Create legend while every process still has its own color
+        if len(unique_pids) <= len(colors):
+            patches = [plt.Rectangle((0,0),1,1, fc=pid_to_color[pid]) for pid in unique_pids]
+            ax.legend(patches, [f"P{pid}" for pid in unique_pids], loc='upper right')
         
-        # Embed in Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.gantt_canvas_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return fig
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,142 @@
+# Scheduler benchmarks.
+#
+# Times every algorithm in scheduler.py over synthetic workloads (see
+# workload.py) of growing size and different arrival/burst shapes, and writes
+# the results as JSON so runs from different commits can be compared:
+#
+#     python bench.py --sizes 10 1000 100000 --output bench.json
+#
+# Each case reports the best wall time over --repeat runs, the peak memory
+# allocated during a separate traced run, and the wall time per Gantt segment,
+# along with the schedule's waiting time percentiles, mean response time and
+# throughput from metrics.table_metrics (and the time they took).
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from metrics import table_metrics
+import scheduler
+import workload
+
+SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+
+# Workload shapes benchmarked by default; any of workload.ARRIVALS and
+# workload.BURSTS can be chosen on the command line
+ARRIVALS = ("poisson", "batch")
+BURSTS = ("uniform", "exponential", "pareto")
+
+
+def run_case(table, algorithm, quantum, repeat):
+    # Best-of-repeat wall time, then one traced run for peak memory
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results, gantt_chart_data, _ = scheduler.simulate(table, algorithm, quantum)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    segments = len(gantt_chart_data)
+
+    # Schedule quality, timed separately from the simulation
+    start = time.perf_counter()
+    quality = table_metrics(results, gantt_chart_data)
+    metrics_s = time.perf_counter() - start
+    del results, gantt_chart_data
+
+    tracemalloc.start()
+    scheduler.simulate(table, algorithm, quantum)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "wall_s": best,
+        "peak_bytes": peak,
+        "segments": segments,
+        "ns_per_segment": best * 1e9 / segments if segments else 0,
+        "metrics_s": metrics_s,
+        "avg_waiting": quality.get("avg_waiting", 0.0),
+        "p95_waiting": quality.get("p95_waiting", 0.0),
+        "p99_waiting": quality.get("p99_waiting", 0.0),
+        "avg_response": quality.get("avg_response", 0.0),
+        "throughput": quality.get("throughput", 0.0)
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=SIZES, algorithms=scheduler.ALGORITHMS, arrivals=ARRIVALS,
+                   bursts=BURSTS, quantum=2, repeat=3, seed=0, log=None):
+    results = []
+    for size in sizes:
+        for arrival_shape in arrivals:
+            for burst_shape in bursts:
+                table = workload.generate(size, arrival_shape, burst_shape, seed=seed)
+                for algorithm in algorithms:
+                    case = {
+                        "algorithm": algorithm,
+                        "size": size,
+                        "arrivals": arrival_shape,
+                        "bursts": burst_shape,
+                        "quantum": quantum if algorithm in scheduler.QUANTUM_ALGORITHMS else None
+                    }
+                    case.update(run_case(table, algorithm, quantum, repeat))
+                    results.append(case)
+                    if log is not None:
+                        log(case)
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling algorithms")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--algorithms", nargs="+", default=list(scheduler.ALGORITHMS),
+                        choices=scheduler.ALGORITHMS)
+    parser.add_argument("--arrivals", nargs="+", default=list(ARRIVALS), choices=workload.ARRIVALS)
+    parser.add_argument("--bursts", nargs="+", default=list(BURSTS), choices=workload.BURSTS)
+    parser.add_argument("--quantum", type=int, default=2, help="RR/MLFQ/CFS time quantum")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.repeat <= 0:
+        parser.error("--repeat must be a positive integer")
+    if args.quantum <= 0:
+        parser.error("--quantum must be a positive integer")
+    if min(args.sizes) < 0:
+        parser.error("--sizes must not be negative")
+
+    def log(case):
+        print(f"{case['algorithm']:8} n={case['size']:<8} {case['arrivals']:7} {case['bursts']:11} "
+              f"{case['wall_s']:9.4f}s {case['peak_bytes'] / 1e6:9.2f}MB "
+              f"{case['ns_per_segment']:8.0f}ns/seg p99 wait {case['p99_waiting']:.0f}", file=sys.stderr)
+
+    report = run_benchmarks(args.sizes, args.algorithms, args.arrivals, args.bursts,
+                            args.quantum, args.repeat, args.seed, log)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# Randomized equivalence checks.
+#
+# The faster engines have to schedule exactly like the simple ones they
+# replaced or sit next to. This runs many small random workloads through each
+# pair and stops at the first difference:
+#
+#     python check_equivalence.py --trials 500 --seed 1
+#
+# - IncrementalSimulation after random adds and deletes vs. a full
+#   scheduler.simulate of the edited table
+# - event-driven SRTF vs. the original one-time-unit-at-a-time SRTF
+# - traces.replay (streaming) vs. scheduler.simulate
+# - smp.simulate_smp on one CPU vs. scheduler.simulate
+import argparse
+import random
+import sys
+
+from incremental import IncrementalSimulation
+from process_table import ProcessTable
+import scheduler
+from smp import simulate_smp
+import traces
+
+
+def random_processes(rng, size, max_arrival=30, max_burst=9):
+    pids = rng.sample(range(1, 10 * size + 1), size)
+    return [{"pid": pid, "arrival": rng.randint(0, max_arrival), "burst": rng.randint(1, max_burst),
+             "priority": rng.randint(0, 4)} for pid in pids]
+
+
+def reference_srtf(processes):
+    # The original SRTF: advance one time unit at a time, running the
+    # arrived process with the least remaining time (ties to the earlier row)
+    processes = [dict(p, remaining=p["burst"]) for p in processes]
+    gantt_chart_data = []
+    current_time = 0
+    completed = 0
+    prev_process = None
+    while completed < len(processes):
+        selected = None
+        for p in processes:
+            if p["arrival"] <= current_time and p["remaining"] > 0:
+                if selected is None or p["remaining"] < selected["remaining"]:
+                    selected = p
+        if selected is None:
+            current_time += 1
+            continue
+        if prev_process is not selected:
+            gantt_chart_data.append({"pid": selected["pid"], "start": current_time, "end": current_time + 1})
+        selected["remaining"] -= 1
+        current_time += 1
+        gantt_chart_data[-1]["end"] = current_time
+        prev_process = selected
+        if selected["remaining"] == 0:
+            selected["completion"] = current_time
+            completed += 1
+            prev_process = None
+    return gantt_chart_data, [p["completion"] for p in processes]
+
+
+def check_incremental(rng, trials):
+    # Small checkpoint gaps so edits actually resume from mid-run state
+    interval = scheduler.CHECKPOINT_INTERVAL
+    scheduler.CHECKPOINT_INTERVAL = 3
+    try:
+        for trial in range(trials):
+            table = ProcessTable.from_dicts(random_processes(rng, rng.randint(1, 40), 60, 8))
+            for algorithm in scheduler.ALGORITHMS:
+                quantum = rng.randint(1, 3)
+                sim = IncrementalSimulation()
+                current = table.copy()
+                sim.simulate(current, algorithm, quantum)
+                for step in range(6):
+                    # Several edits between two simulate calls, as in the GUI
+                    changed_from = None
+                    for _ in range(rng.randint(1, 3)):
+                        arrival = edit_table(rng, current)
+                        changed_from = arrival if changed_from is None else min(changed_from, arrival)
+                    results, gantt_chart_data, metrics = sim.simulate(current, algorithm, quantum,
+                                                                      changed_from=changed_from)
+                    expected = scheduler.simulate(current, algorithm, quantum)
+                    context = f"incremental {algorithm} q={quantum}, trial {trial} step {step}"
+                    assert gantt_chart_data == expected[1], context
+                    assert list(results.completion) == list(expected[0].completion), context
+                    assert list(results.waiting) == list(expected[0].waiting), context
+                    assert abs(metrics["avg_waiting"] - expected[2]["avg_waiting"]) < 1e-9, context
+    finally:
+        scheduler.CHECKPOINT_INTERVAL = interval
+
+
+def edit_table(rng, table):
+    # Add, delete or re-add (delete and append again under the same PID) a
+    # random process; returns the earliest arrival time the edit touched
+    choice = rng.random()
+    if choice < 0.5 or len(table) < 2:
+        used = set(table.pid)
+        pid = rng.choice([pid for pid in range(1, 1000) if pid not in used])
+        arrival = rng.randint(0, 80)
+        table.append(pid, arrival, rng.randint(1, 8), rng.randint(0, 4))
+        return arrival
+    if choice < 0.8:
+        rows = rng.sample(range(len(table)), rng.randint(1, 2))
+        changed_from = min(table.arrival[i] for i in rows)
+        table.delete([table.pid[i] for i in rows])
+        return changed_from
+    i = rng.randrange(len(table))
+    pid, old_arrival = table.pid[i], table.arrival[i]
+    arrival = rng.randint(0, 80)
+    table.delete([pid])
+    table.append(pid, arrival, rng.randint(1, 8), rng.randint(0, 4))
+    return min(old_arrival, arrival)
+
+
+def check_srtf(rng, trials):
+    for trial in range(trials):
+        processes = random_processes(rng, rng.randint(1, 15), 15, 12)
+        results, gantt_chart_data, _ = scheduler.simulate(processes, "SRTF")
+        expected_gantt, expected_completion = reference_srtf(processes)
+        assert gantt_chart_data == expected_gantt, f"SRTF, trial {trial}: {processes}"
+        assert list(results.completion) == expected_completion, f"SRTF, trial {trial}: {processes}"
+
+
+def check_replay(rng, trials):
+    for trial in range(trials):
+        # Traces are sorted by arrival; ties keep the trace order
+        processes = sorted(random_processes(rng, rng.randint(1, 30)), key=lambda p: p["arrival"])
+        for algorithm in scheduler.CLASSIC_ALGORITHMS:
+            quantum = rng.randint(1, 4)
+            segments, finished = [], {}
+            totals = traces.replay(processes, algorithm, quantum, segments.append,
+                                   lambda p: finished.__setitem__(p["pid"], p["completion"]))
+            results, gantt_chart_data, metrics = scheduler.simulate(processes, algorithm, quantum)
+            context = f"replay {algorithm} q={quantum}, trial {trial}"
+            assert segments == gantt_chart_data, context
+            assert finished == dict(zip(results.pid, results.completion)), context
+            assert abs(totals["avg_waiting"] - metrics["avg_waiting"]) < 1e-9, context
+
+
+def check_smp(rng, trials):
+    for trial in range(trials):
+        processes = random_processes(rng, rng.randint(1, 25))
+        for algorithm in scheduler.CLASSIC_ALGORITHMS:
+            quantum = rng.randint(1, 3)
+            results, gantt_chart_data, _ = scheduler.simulate(processes, algorithm, quantum)
+            for per_core_queues in (False, True):
+                smp_results, smp_gantt, _ = simulate_smp(processes, algorithm, quantum, cpus=1,
+                                                         per_core_queues=per_core_queues)
+                context = f"smp {algorithm} q={quantum}, trial {trial}"
+                assert [{key: value for key, value in entry.items() if key != "cpu"}
+                        for entry in smp_gantt] == gantt_chart_data, context
+                assert list(smp_results.completion) == list(results.completion), context
+
+
+CHECKS = {
+    "incremental": check_incremental,
+    "srtf": check_srtf,
+    "replay": check_replay,
+    "smp": check_smp
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the schedulers against each other on random workloads")
+    parser.add_argument("--trials", type=int, default=300, help="random workloads per check")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checks", nargs="+", choices=CHECKS, default=list(CHECKS))
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for name in args.checks:
+        try:
+            CHECKS[name](rng, args.trials)
+        except AssertionError as e:
+            print(f"{name}: FAILED ({e})")
+            return 1
+        print(f"{name}: ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
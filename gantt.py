@@ -0,0 +1,82 @@
+# Gantt chart segment reduction for rendering.
+#
+# Long schedules (RR with a small quantum over a big trace) produce far more
+# segments than there are pixels to draw them on. These helpers shrink a
+# segment list to what can actually be seen before it reaches matplotlib.
+# A segment is a dict with "pid", "start" and "end" keys, sorted by start.
+
+
+def coalesce_segments(segments):
+    # Merge back-to-back segments of the same process into one
+    merged = []
+    for item in segments:
+        last = merged[-1] if merged else None
+        if last and last["pid"] == item["pid"] and last["end"] == item["start"]:
+            last["end"] = item["end"]
+        else:
+            merged.append({"pid": item["pid"], "start": item["start"], "end": item["end"]})
+    return merged
+
+
+def downsample_segments(segments, width, start=None, end=None):
+    # Reduce segments to at most one per pixel column across [start, end).
+    # Each column is given to the process that ran longest inside it, and
+    # neighbouring columns owned by the same process are merged again.
+    if not segments:
+        return []
+    if start is None:
+        start = segments[0]["start"]
+    if end is None:
+        end = segments[-1]["end"]
+
+    visible = [item for item in segments if item["end"] > start and item["start"] < end]
+    if len(visible) <= width or end <= start:
+        return coalesce_segments(visible)
+
+    bucket = (end - start) / width
+    owner = [None] * width
+    current = None   # column being accumulated
+    occupancy = {}   # pid -> time spent in the current column
+
+    def flush():
+        if current is not None and occupancy:
+            owner[current] = max(occupancy, key=occupancy.get)
+
+    for item in visible:
+        s = max(item["start"], start)
+        e = min(item["end"], end)
+        first = min(int((s - start) / bucket), width - 1)
+        last = int((e - start) / bucket)
+        if start + last * bucket >= e:
+            # Segment ends exactly on a column boundary
+            last -= 1
+        last = max(first, min(last, width - 1))
+
+        for column in (first, last) if first != last else (first,):
+            if column != current:
+                flush()
+                current = column
+                occupancy = {}
+            column_start = start + column * bucket
+            overlap = min(e, column_start + bucket) - max(s, column_start)
+            occupancy[item["pid"]] = occupancy.get(item["pid"], 0) + overlap
+            if column == first and last > first:
+                # Columns strictly inside the segment belong to it outright
+                flush()
+                for inner in range(first + 1, last):
+                    owner[inner] = item["pid"]
+
+    flush()
+
+    # Turn runs of equally-owned columns back into segments
+    result = []
+    for column, pid in enumerate(owner):
+        if pid is None:
+            continue
+        column_start = start + column * bucket
+        last = result[-1] if result else None
+        if last and last["pid"] == pid and last["end"] == column_start:
+            last["end"] = column_start + bucket
+        else:
+            result.append({"pid": pid, "start": column_start, "end": column_start + bucket})
+    return result
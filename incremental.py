@@ -0,0 +1,193 @@
+# Incremental re-simulation.
+#
+# Keeps the last schedule together with checkpoints of the scheduler's loop
+# state, and after processes are added or deleted replays only from the last
+# checkpoint before the earliest affected arrival time:
+#
+#     sim = IncrementalSimulation()
+#     sim.simulate(processes, "RR", 2)                    # full run
+#     processes.append(99, 5000, 3, 0)
+#     sim.simulate(processes, "RR", 2, changed_from=5000)  # replays from ~5000
+#
+# A checkpoint taken at time c only depends on processes that arrived by c, so
+# it stays valid for any edit to processes arriving after c. Appending rows to
+# the end of the table is the fast path; deletions remap rows and recompute
+# the metrics over the whole table. Algorithms without checkpoint support
+# (MLFQ, CFS) always run in full.
+from array import array
+import bisect
+
+import instrument
+from process_table import INPUT_COLUMNS, TYPECODE
+from result_cache import fingerprint
+import scheduler
+
+
+class IncrementalSimulation:
+    def __init__(self):
+        self.config = None
+        self.dirty_from = None
+        self.results = None
+        self.gantt_chart_data = None
+        self.metrics = None
+        self.order = None
+        self.fingerprint = None
+        self.checkpoints = []
+        self.checkpoint_times = []
+
+    def simulate(self, processes, algorithm="FCFS", quantum=2, changed_from=None, progress=None):
+        # Schedule the ProcessTable processes. changed_from is the earliest
+        # arrival time of any process added, deleted or edited since the last
+        # call. Returns (results, gantt_chart_data, metrics) like
+        # scheduler.simulate; the returned objects must not be modified.
+        scheduler.check_algorithm(algorithm, quantum)
+        self.invalidate(changed_from)
+
+        config = (algorithm, quantum if algorithm in scheduler.QUANTUM_ALGORITHMS else None)
+        current = fingerprint(processes)
+        if config != self.config or self.results is None:
+            self.full_run(processes, algorithm, quantum, progress)
+        elif current == self.fingerprint:
+            # Same input as last time, e.g. an edit that was undone
+            pass
+        elif self.dirty_from is None:
+            # The input changed without a recorded edit: nothing to resume from
+            self.full_run(processes, algorithm, quantum, progress)
+        else:
+            index = bisect.bisect_left(self.checkpoint_times, self.dirty_from) - 1
+            if index < 0:
+                self.full_run(processes, algorithm, quantum, progress)
+            else:
+                self.resume_run(processes, algorithm, quantum, index, progress)
+
+        self.config = config
+        self.fingerprint = current
+        self.dirty_from = None
+        return self.results, self.gantt_chart_data, self.metrics
+
+    def invalidate(self, changed_from):
+        # Record an edit without re-simulating; the next simulate call
+        # replays from the earliest recorded arrival time
+        if changed_from is not None:
+            self.dirty_from = changed_from if self.dirty_from is None else min(self.dirty_from, changed_from)
+
+    def reset(self):
+        # Forget the cached schedule so the next call runs from scratch
+        self.results = None
+
+    def full_run(self, processes, algorithm, quantum, progress):
+        results = processes.copy()
+        results.reset()
+        order = scheduler.arrival_order(results)
+        checkpoints = []
+        with instrument.phase("dispatch"):
+            if algorithm in scheduler.CLASSIC_ALGORITHMS:
+                resume = {"time": 0, "consumed": 0, "completed": 0, "queue": [], "order": order,
+                          "gantt": []}
+                gantt_chart_data = scheduler.run_algorithm(results, algorithm, quantum, progress,
+                                                           checkpoints.append, resume)
+            else:
+                gantt_chart_data = scheduler.run_algorithm(results, algorithm, quantum, progress)
+        with instrument.phase("metrics"):
+            metrics = scheduler.calculate_metrics(results)
+        instrument.record_run(results, algorithm, gantt_chart_data)
+
+        # Only keep the new state once the run has finished
+        self.results, self.gantt_chart_data, self.metrics = results, gantt_chart_data, metrics
+        self.order = order
+        self.checkpoints = checkpoints
+        self.checkpoint_times = [state["time"] for state in checkpoints]
+
+    def resume_run(self, processes, algorithm, quantum, index, progress):
+        state = self.checkpoints[index]
+        old = self.results
+        results = processes.copy()
+        n_old = len(old)
+
+        # Rows were only appended if every earlier row is unchanged, not just
+        # its PID: a process deleted and re-added with another arrival time
+        # keeps its PID but needs a new place in the arrival order
+        appended = len(results) >= n_old and all(
+            getattr(results, column)[:n_old] == getattr(old, column) for column in INPUT_COLUMNS)
+        if appended:
+            # Existing rows keep their positions: carry over their output
+            # columns and slot the new rows into the arrival order
+            for column in ("remaining", "completion", "waiting", "turnaround"):
+                values = array(TYPECODE, getattr(old, column))
+                values.extend(getattr(results, column)[n_old:])
+                setattr(results, column, values)
+            order = list(self.order)
+            arrival = results.arrival
+            for i in range(n_old, len(results)):
+                bisect.insort_right(order, i, key=arrival.__getitem__)
+            queue = state["queue"]
+        else:
+            # Rows moved: map the finished processes and the ready queue over by PID
+            results.reset()
+            new_row = {pid: i for i, pid in enumerate(results.pid)}
+            for i in range(n_old):
+                j = new_row.get(old.pid[i])
+                if j is not None:
+                    results.completion[j] = old.completion[i]
+                    results.remaining[j] = 0
+            order = scheduler.arrival_order(results)
+            queue = [new_row[old.pid[i]] for i in state["queue"]]
+
+        # Everything from the checkpoint on is scheduled again
+        replayed = order[state["consumed"]:]
+        for i in replayed:
+            results.remaining[i] = results.burst[i]
+            results.completion[i] = 0
+        for i, remaining in zip(queue, state["remaining"]):
+            results.remaining[i] = remaining
+            results.completion[i] = 0
+
+        gantt_chart_data = self.gantt_chart_data[:state["segments"]]
+        if gantt_chart_data:
+            # The last entry may have been extended after the checkpoint
+            gantt_chart_data[-1] = dict(gantt_chart_data[-1], end=state["last_end"])
+
+        checkpoints = self.checkpoints[:index]
+        if not appended:
+            # Earlier checkpoints refer to the old row numbers as well
+            checkpoints = [dict(cp, queue=[new_row[old.pid[i]] for i in cp["queue"]])
+                           for cp in checkpoints]
+        resume = {
+            "time": state["time"],
+            "consumed": state["consumed"],
+            "completed": state["completed"],
+            "queue": queue,
+            "order": order,
+            "gantt": gantt_chart_data
+        }
+        with instrument.phase("replay"):
+            gantt_chart_data = scheduler.run_algorithm(results, algorithm, quantum, progress,
+                                                       checkpoints.append, resume)
+
+        with instrument.phase("metrics"):
+            if appended:
+                # Only the replayed rows can have changed
+                metrics = update_metrics(results, queue + replayed)
+            else:
+                metrics = scheduler.calculate_metrics(results)
+        instrument.record_run(results, algorithm, gantt_chart_data)
+
+        self.results, self.gantt_chart_data, self.metrics = results, gantt_chart_data, metrics
+        self.order = order
+        self.checkpoints = checkpoints
+        self.checkpoint_times = [state["time"] for state in checkpoints]
+
+
+def update_metrics(table, rows):
+    # Recompute turnaround/waiting for rows and return the new averages
+    arrival, burst, completion = table.arrival, table.burst, table.completion
+    waiting, turnaround = table.waiting, table.turnaround
+    for i in rows:
+        turnaround[i] = completion[i] - arrival[i]
+        waiting[i] = turnaround[i] - burst[i]
+
+    n = len(table)
+    return {
+        "avg_waiting": sum(waiting) / n if n else 0,
+        "avg_turnaround": sum(turnaround) / n if n else 0
+    }
@@ -0,0 +1,216 @@
+# Opt-in profiling for the scheduler engine and the GUI.
+#
+# Nothing is recorded until a Profiler is enabled, and the disabled path is a
+# single global check per phase, so the dispatch loops run at full speed:
+#
+#     import instrument
+#     profiler = instrument.enable()
+#     simulate(processes, "RR", 2)
+#     profiler.write_json("profile.json")           # totals per phase/counter
+#     profiler.write_chrome_trace("profile.trace")  # chrome://tracing, Perfetto
+#
+# To profile without editing any code, set SCHED_PROFILE to an output path
+# before starting a script (and SCHED_PROFILE_FORMAT=chrome for a Chrome
+# trace); the profile is written when the interpreter exits.
+#
+# Phases are timed with phase(name). Every scheduler run also adds counters
+# derived from its result: dispatches, preemptions (including RR slice ends),
+# idle time and the mean and largest ready queue length. Callbacks registered
+# with Profiler.on(event, callback) are called with the event's data for
+# "phase_start", "phase_end" and "run" events.
+from contextlib import contextmanager, nullcontext
+import atexit
+import json
+import os
+import threading
+import time
+
+# The enabled profiler, if any
+active = None
+
+_disabled = nullcontext()
+
+
+class Profiler:
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.spans = []     # (name, start ns, duration ns, thread id)
+        self.counters = {}
+        self.runs = []
+        self.hooks = {}
+
+    def on(self, event, callback):
+        self.hooks.setdefault(event, []).append(callback)
+
+    def emit(self, event, **data):
+        for callback in self.hooks.get(event, ()):
+            callback(**data)
+
+    @contextmanager
+    def phase(self, name):
+        self.emit("phase_start", name=name)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            self.spans.append((name, start - self.origin, duration, threading.get_ident()))
+            self.emit("phase_end", name=name, duration=duration / 1e9)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_run(self, algorithm, counters):
+        for name, value in counters.items():
+            if name.startswith("max_"):
+                self.counters[name] = max(self.counters.get(name, 0), value)
+            elif not name.startswith("mean_"):
+                self.count(name, value)
+        run = dict(counters, algorithm=algorithm, time=(time.perf_counter_ns() - self.origin) / 1e9)
+        self.runs.append(run)
+        self.emit("run", **run)
+
+    def summary(self):
+        # Totals per phase plus the counters and per-run records
+        phases = {}
+        for name, _, duration, _ in self.spans:
+            totals = phases.setdefault(name, {"calls": 0, "total_s": 0.0, "max_s": 0.0})
+            totals["calls"] += 1
+            totals["total_s"] += duration / 1e9
+            totals["max_s"] = max(totals["max_s"], duration / 1e9)
+        return {"phases": phases, "counters": dict(self.counters), "runs": list(self.runs)}
+
+    def chrome_trace(self):
+        # Trace Event Format: one complete ("X") event per phase and one
+        # counter ("C") event per run
+        pid = os.getpid()
+        events = [{
+            "name": name,
+            "ph": "X",
+            "ts": start / 1e3,
+            "dur": duration / 1e3,
+            "pid": pid,
+            "tid": tid
+        } for name, start, duration, tid in self.spans]
+        for run in self.runs:
+            events.append({
+                "name": run["algorithm"],
+                "ph": "C",
+                "ts": run["time"] * 1e6,
+                "pid": pid,
+                "args": {name: value for name, value in run.items() if name not in ("algorithm", "time")}
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def enable(profiler=None):
+    # Start recording into profiler (a new one by default) and return it
+    global active
+    active = profiler if profiler is not None else Profiler()
+    return active
+
+
+def disable():
+    global active
+    profiler, active = active, None
+    return profiler
+
+
+def phase(name):
+    # Time a block as phase name when profiling, otherwise do nothing
+    if active is None:
+        return _disabled
+    return active.phase(name)
+
+
+def record_run(table, algorithm, gantt_chart_data, cpus=1, extra=None, phases=None):
+    # Add the counters of a finished run to the active profiler; phases maps
+    # row -> CPU/I/O bursts for runs with I/O (see smp.burst_phases)
+    if active is None:
+        return
+    counters = schedule_counters(table, gantt_chart_data, cpus, phases)
+    if extra:
+        counters.update(extra)
+        if "idle_time" in counters:
+            # Time spent switching is not idle
+            counters["idle_time"] -= extra.get("switch_time", 0)
+    active.record_run(algorithm, counters)
+
+
+def schedule_counters(table, gantt_chart_data, cpus=1, phases=None):
+    # Counters derived from a finished schedule, so the dispatch loops don't
+    # have to maintain them
+    n = len(table)
+    dispatches = len(gantt_chart_data)
+    counters = {
+        "processes": n,
+        "dispatches": dispatches,
+        "preemptions": max(dispatches - n, 0)
+    }
+    if not n:
+        return counters
+
+    arrival, completion = table.arrival, table.completion
+    span = max(completion) - min(arrival)
+    counters["idle_time"] = max(cpus * span - sum(table.burst), 0)
+    if not isinstance(gantt_chart_data, list):
+        # Streamed to a sink that can't be read back
+        return counters
+
+    # Ready queue length by Little's law (time spent waiting / span) and by
+    # summing the changes at each time: +1 for an arrival or the end of an
+    # unfinished run (after the I/O burst that follows it, if any), -1 for a
+    # dispatch. Netting per time keeps a process that is dispatched again at
+    # once from counting as queued.
+    counters["mean_queue_length"] = sum(table.waiting) / span if span else 0
+    finished = {(pid, end) for pid, end in zip(table.pid, completion)}
+    io_after = {}  # pid -> {CPU time used at the end of a CPU burst: I/O burst}
+    for i, bursts in (phases or {}).items():
+        used = 0
+        io_after[table.pid[i]] = after = {}
+        for k in range(0, len(bursts) - 1, 2):
+            used += bursts[k]
+            after[used] = bursts[k + 1]
+    changes = {}
+    for t in arrival:
+        changes[t] = changes.get(t, 0) + 1
+    ran = {}
+    for item in gantt_chart_data:
+        pid, start, end = item["pid"], item["start"], item["end"]
+        changes[start] = changes.get(start, 0) - 1
+        if (pid, end) in finished:
+            continue
+        if pid in io_after:
+            ran[pid] = ran.get(pid, 0) + end - start
+            end += io_after[pid].get(ran[pid], 0)
+        changes[end] = changes.get(end, 0) + 1
+    length = longest = 0
+    for t in sorted(changes):
+        length += changes[t]
+        longest = max(longest, length)
+    counters["max_queue_length"] = longest
+    return counters
+
+
+def _write_at_exit(path, chrome):
+    profiler = active
+    if profiler is None:
+        return
+    if chrome:
+        profiler.write_chrome_trace(path)
+    else:
+        profiler.write_json(path)
+
+
+if os.environ.get("SCHED_PROFILE"):
+    enable()
+    atexit.register(_write_at_exit, os.environ["SCHED_PROFILE"],
+                    os.environ.get("SCHED_PROFILE_FORMAT") == "chrome")
@@ -0,0 +1,86 @@
+# Vectorized schedule metrics.
+#
+# Computes per-process turnaround/waiting/response times and the summary
+# statistics for a whole schedule with NumPy array operations, so evaluating
+# millions of jobs does not go through a per-process Python loop. Kept out of
+# scheduler.py so the core engine does not need NumPy.
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+def compute_metrics(arrival, burst, completion, first_start=None):
+    # arrival, burst, completion (and optionally first_start, the time each
+    # process first got the CPU) are equal-length sequences in the same row
+    # order. Returns a dict of per-process arrays and summary statistics.
+    arrival = np.asarray(arrival, dtype=np.int64)
+    burst = np.asarray(burst, dtype=np.int64)
+    completion = np.asarray(completion, dtype=np.int64)
+    n = len(arrival)
+
+    turnaround = completion - arrival
+    waiting = turnaround - burst
+
+    metrics = {
+        "turnaround": turnaround,
+        "waiting": waiting,
+        "count": n
+    }
+    if n == 0:
+        return metrics
+
+    # Schedule span runs from the first arrival to the last completion
+    span = int(completion.max() - arrival.min())
+    busy_time = int(burst.sum())
+    metrics["avg_turnaround"] = float(turnaround.mean())
+    metrics["avg_waiting"] = float(waiting.mean())
+    metrics["throughput"] = n / span if span else 0.0
+    metrics["cpu_utilization"] = busy_time / span if span else 0.0
+    for pct, value in zip(PERCENTILES, np.percentile(waiting, PERCENTILES)):
+        metrics[f"p{pct}_waiting"] = float(value)
+
+    if first_start is not None:
+        response = np.asarray(first_start, dtype=np.int64) - arrival
+        metrics["response"] = response
+        metrics["avg_response"] = float(response.mean())
+
+    return metrics
+
+
+def first_start_times(pid, gantt_chart_data):
+    # Time each process first ran, aligned with the rows of pid
+    pid = np.asarray(pid, dtype=np.int64)
+    if hasattr(gantt_chart_data, "columns"):
+        # A segment_log.SegmentLog - use the mapped columns as they are
+        seg_pid, seg_start, _ = gantt_chart_data.columns()
+    else:
+        seg_pid = np.fromiter((item["pid"] for item in gantt_chart_data), dtype=np.int64,
+                              count=len(gantt_chart_data))
+        seg_start = np.fromiter((item["start"] for item in gantt_chart_data), dtype=np.int64,
+                                count=len(gantt_chart_data))
+
+    # Map each segment's PID back to its row
+    order = np.argsort(pid, kind="stable")
+    rows = order[np.searchsorted(pid[order], seg_pid)]
+
+    first_start = np.full(len(pid), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first_start, rows, seg_start)
+    return first_start
+
+
+def table_metrics(table, gantt_chart_data=None):
+    # Metrics for a simulated ProcessTable. The columns are viewed in place
+    # without copying, and the waiting/turnaround columns are filled in the
+    # same way scheduler.calculate_metrics does.
+    arrival = np.frombuffer(table.arrival, dtype=np.int64)
+    burst = np.frombuffer(table.burst, dtype=np.int64)
+    completion = np.frombuffer(table.completion, dtype=np.int64)
+    first_start = None
+    if gantt_chart_data is not None:
+        first_start = first_start_times(np.frombuffer(table.pid, dtype=np.int64), gantt_chart_data)
+
+    metrics = compute_metrics(arrival, burst, completion, first_start)
+    if len(table):
+        np.frombuffer(table.turnaround, dtype=np.int64)[:] = metrics["turnaround"]
+        np.frombuffer(table.waiting, dtype=np.int64)[:] = metrics["waiting"]
+    return metrics
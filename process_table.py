@@ -0,0 +1,80 @@
+# Compact, column-oriented process store.
+#
+# Each field is held in its own typed array instead of one dict per process,
+# which cuts memory per process from several hundred bytes to a few dozen and
+# lets the scheduling loops index plain integer columns. Row i of every column
+# describes the same process, in the order the processes were added.
+from array import array
+
+# Signed 64-bit integers for every column
+TYPECODE = "q"
+
+# Input columns describe the workload, output columns are filled in by the
+# schedulers and calculate_metrics
+INPUT_COLUMNS = ("pid", "arrival", "burst", "priority")
+OUTPUT_COLUMNS = ("remaining", "completion", "waiting", "turnaround")
+
+
+class ProcessTable:
+    __slots__ = INPUT_COLUMNS + OUTPUT_COLUMNS
+
+    def __init__(self):
+        for column in self.__slots__:
+            setattr(self, column, array(TYPECODE))
+
+    @classmethod
+    def from_dicts(cls, processes):
+        # Build a table from any iterable of process dicts
+        table = cls()
+        for process in processes:
+            table.append(process["pid"], process["arrival"], process["burst"], process["priority"])
+        return table
+
+    def append(self, pid, arrival, burst, priority):
+        self.pid.append(pid)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+        self.remaining.append(burst)
+        self.completion.append(0)
+        self.waiting.append(0)
+        self.turnaround.append(0)
+
+    def copy(self):
+        table = ProcessTable()
+        for column in self.__slots__:
+            setattr(table, column, array(TYPECODE, getattr(self, column)))
+        return table
+
+    def reset(self):
+        # Clear scheduler output so the table can be simulated again
+        n = len(self.pid)
+        self.remaining = array(TYPECODE, self.burst)
+        self.completion = array(TYPECODE, bytes(8 * n))
+        self.waiting = array(TYPECODE, bytes(8 * n))
+        self.turnaround = array(TYPECODE, bytes(8 * n))
+
+    def delete(self, pids):
+        # Remove every process whose PID is in pids, in a single pass
+        pids = set(pids)
+        keep = [i for i, pid in enumerate(self.pid) if pid not in pids]
+        for column in self.__slots__:
+            values = getattr(self, column)
+            setattr(self, column, array(TYPECODE, [values[i] for i in keep]))
+
+    def row(self, i):
+        return {column: getattr(self, column)[i] for column in self.__slots__}
+
+    def to_dicts(self):
+        return [self.row(i) for i in range(len(self.pid))]
+
+    def nbytes(self):
+        # Memory held by the column buffers
+        total = 0
+        for column in self.__slots__:
+            values = getattr(self, column)
+            total += len(values) * values.itemsize
+        return total
+
+    def __len__(self):
+        return len(self.pid)
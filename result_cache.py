@@ -0,0 +1,161 @@
+# Memoized simulation results.
+#
+# An LRU cache of (results, gantt_chart_data, metrics) keyed by a hash of the
+# process set plus the algorithm and quantum, so re-running a configuration
+# that was already simulated - e.g. toggling between algorithms to compare
+# them - is a lookup instead of a new run:
+#
+#     cache = ResultCache(max_bytes=256 * 2**20, directory=".schedule_cache")
+#     results, gantt_chart_data, metrics = cached_simulate(cache, processes, "RR", 2)
+#
+# Entries are evicted least-recently-used first once their estimated size
+# passes max_bytes. With a directory, entries are also pickled to disk and
+# survive restarts; the directory is trimmed the same way to max_disk_bytes.
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+
+from process_table import INPUT_COLUMNS, ProcessTable
+import scheduler
+
+# Rough size of one Gantt chart entry: the dict plus its three ints
+SEGMENT_BYTES = 300
+
+
+def fingerprint(processes):
+    # Hash of the input columns of a ProcessTable, in row order
+    digest = hashlib.blake2b(digest_size=16)
+    for column in INPUT_COLUMNS:
+        values = getattr(processes, column)
+        digest.update(len(values).to_bytes(8, "little"))
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(processes, algorithm, quantum, cpus=1, per_core_queues=False, switch_cost=0):
+    if algorithm not in scheduler.QUANTUM_ALGORITHMS:
+        quantum = 0
+    key = f"{fingerprint(processes)}-{algorithm}-{quantum}"
+    if cpus > 1:
+        key += f"-{cpus}{'p' if per_core_queues else 'g'}"
+    if switch_cost:
+        key += f"-cs{switch_cost}"
+    return key
+
+
+def entry_size(entry):
+    results, gantt_chart_data, _ = entry
+    return results.nbytes() + len(gantt_chart_data) * SEGMENT_BYTES
+
+
+class ResultCache:
+    def __init__(self, max_bytes=256 * 2**20, directory=None, max_disk_bytes=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else max_bytes
+        self.entries = OrderedDict()  # key -> (entry, size), oldest first
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        # Return the cached entry for key, or None
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+
+        entry = self.load(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        # entry is (results, gantt_chart_data, metrics); it must not be
+        # modified afterwards since later hits return the same objects
+        self.remember(key, entry)
+        self.save(key, entry)
+
+    def remember(self, key, entry):
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[1]
+        size = entry_size(entry)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (entry, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".pickle")
+
+    def load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, ImportError):
+            # Missing, truncated, corrupt or written by an older version
+            return None
+        # Touch the file so disk eviction sees it as recently used
+        os.utime(self.path(key))
+        return entry
+
+    def save(self, key, entry):
+        if self.directory is None:
+            return
+        tmp = self.path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = f.tell()
+        if size > self.max_disk_bytes:
+            # Like remember: an entry that can't fit would only evict the rest
+            os.remove(tmp)
+            return
+        os.replace(tmp, self.path(key))
+        self.trim_disk()
+
+    def trim_disk(self):
+        # Delete the least recently used files until under max_disk_bytes
+        files = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".pickle"):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, stat.st_size, name))
+                total += stat.st_size
+        files.sort()
+        for _, size, name in files:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pickle"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+def cached_simulate(cache, processes, algorithm="FCFS", quantum=2, progress=None):
+    # scheduler.simulate through cache
+    if not isinstance(processes, ProcessTable):
+        processes = ProcessTable.from_dicts(processes)
+    key = cache_key(processes, algorithm, quantum)
+    entry = cache.get(key)
+    if entry is None:
+        entry = scheduler.simulate(processes, algorithm, quantum, progress)
+        cache.put(key, entry)
+    return entry
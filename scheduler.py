@@ -0,0 +1,639 @@
+# Headless CPU scheduling engine.
+#
+# Pure functions only - no tkinter or matplotlib imports - so the schedulers
+# can be used from scripts, batch jobs and servers without a display:
+#
+#     from scheduler import simulate
+#     results, gantt_chart_data, metrics = simulate(processes, "RR", quantum=2)
+#
+# processes is a ProcessTable or an iterable of dicts with "pid", "arrival",
+# "burst" and "priority" keys. The algorithms themselves run on the columns of
+# a ProcessTable, addressing processes by row index.
+# A Gantt chart entry is a dict with "pid", "start" and "end" keys.
+#
+# A long simulation can report progress through a progress(completed, total)
+# callback, which every algorithm calls after each PROGRESS_INTERVAL
+# completed processes, and the preemptive ones also every PROGRESS_DISPATCHES
+# dispatches, so a few very long processes can't stall it; the callback may
+# raise Cancelled to abort the run.
+#
+# For incremental re-simulation (see incremental.py) every algorithm can also
+# hand snapshots of its loop state to a checkpoint(state) callback, and start
+# from such a snapshot again through resume. A snapshot is taken at the top of
+# the dispatch loop, so it only depends on processes that arrived by its time.
+#
+# Besides the five textbook policies there are two closer to real kernels:
+# MLFQ (multilevel feedback queue with aging) and CFS (a virtual-runtime fair
+# scheduler in the style of Linux CFS). Their tuning knobs can be passed to
+# simulate as options, e.g. options={"quanta": (2, 4, 8), "aging": 50}.
+# They do not support checkpoint/resume.
+#
+# simulate can also charge a context switch cost and model processes that
+# alternate CPU and I/O bursts (switch_cost and io_bursts); those runs go
+# through the event-driven engine in smp.py on a single core, which reports
+# the CPU utilization lost to switching in the metrics.
+#
+# When profiling is enabled (see instrument.py) simulate times its prepare,
+# dispatch and metrics phases and records counters for each run.
+from collections import deque
+import heapq
+import math
+
+import instrument
+from process_table import ProcessTable
+
+CLASSIC_ALGORITHMS = ("FCFS", "SJF", "SRTF", "Priority", "RR")
+ALGORITHMS = CLASSIC_ALGORITHMS + ("MLFQ", "CFS")
+
+# Algorithms that take a time quantum: RR's slice, MLFQ's top-level slice
+# and CFS's minimum granularity
+QUANTUM_ALGORITHMS = ("RR", "MLFQ", "CFS")
+
+# MLFQ defaults: number of levels (each doubling the previous quantum), and
+# aging after this many times the longest quantum spent waiting
+MLFQ_LEVELS = 3
+MLFQ_AGING_FACTOR = 10
+
+# CFS defaults: scheduling latency as a multiple of the minimum granularity,
+# and the load weight of a nice-0 process
+CFS_LATENCY_FACTOR = 6
+NICE_0_WEIGHT = 1024
+
+PROGRESS_INTERVAL = 1000
+PROGRESS_DISPATCHES = 100000
+
+# Minimum number of dispatches between two checkpoints. The gap also grows
+# with the ready queue so copying it stays O(1) per dispatch on average.
+CHECKPOINT_INTERVAL = 1000
+
+
+class Cancelled(Exception):
+    # Raised by a progress callback to stop a running simulation
+    pass
+
+
+def simulate(processes, algorithm="FCFS", quantum=2, progress=None, options=None,
+             switch_cost=0, io_bursts=None, gantt=None):
+    # Run one algorithm over a workload. The input is not modified; returns
+    # (results, gantt_chart_data, metrics) where results is a ProcessTable
+    # with the completion/waiting/turnaround columns filled in. With gantt,
+    # the Gantt chart is streamed into that sink (see run_algorithm) and
+    # returned in place of a list.
+    check_algorithm(algorithm, quantum)
+    if switch_cost or io_bursts:
+        if gantt is not None:
+            raise ValueError("Gantt chart streaming is not supported with switch_cost or io_bursts")
+        # smp imports this module, so it can only be imported here
+        from smp import simulate_smp
+        return simulate_smp(processes, algorithm, quantum, cpus=1, progress=progress,
+                            switch_cost=switch_cost, io_bursts=io_bursts)
+
+    # Work on a copy with remaining time reset
+    with instrument.phase("prepare"):
+        if isinstance(processes, ProcessTable):
+            results = processes.copy()
+            results.reset()
+        else:
+            results = ProcessTable.from_dicts(processes)
+
+    with instrument.phase("dispatch"):
+        gantt_chart_data = run_algorithm(results, algorithm, quantum, progress, options=options,
+                                         gantt=gantt)
+    with instrument.phase("metrics"):
+        metrics = calculate_metrics(results)
+    instrument.record_run(results, algorithm, gantt_chart_data)
+    return results, gantt_chart_data, metrics
+
+
+def check_algorithm(algorithm, quantum):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown scheduling algorithm: {algorithm}")
+    if algorithm in QUANTUM_ALGORITHMS and quantum <= 0:
+        raise ValueError("Time quantum must be a positive integer")
+
+
+def run_algorithm(table, algorithm, quantum=2, progress=None, checkpoint=None, resume=None,
+                  options=None, gantt=None):
+    # Run the selected algorithm in place on table and return its Gantt chart.
+    # Entries are appended to gantt if given (any list-like sink, such as a
+    # segment_log.SegmentWriter), otherwise to a new list.
+    options = options or {}
+    if algorithm == "MLFQ":
+        quanta = tuple(options.get("quanta", (quantum * 2 ** level for level in range(MLFQ_LEVELS))))
+        if not quanta or min(quanta) <= 0:
+            raise ValueError("MLFQ quanta must be one or more positive integers")
+        aging = options.get("aging", MLFQ_AGING_FACTOR * max(quanta))
+        if aging is not None and aging < 0:
+            raise ValueError("MLFQ aging must not be negative")
+        return run_mlfq(table, quanta, aging, progress, gantt)
+    if algorithm == "CFS":
+        latency = options.get("latency")
+        if latency is not None and latency <= 0:
+            raise ValueError("CFS latency must be positive")
+        return run_cfs(table, quantum, latency, progress, gantt)
+    if algorithm == "FCFS":
+        return run_fcfs(table, progress, checkpoint, resume, gantt)
+    if algorithm == "SJF":
+        return run_sjf(table, progress, checkpoint, resume, gantt)
+    if algorithm == "SRTF":
+        return run_srtf(table, progress, checkpoint, resume, gantt)
+    if algorithm == "Priority":
+        return run_priority(table, progress, checkpoint, resume, gantt)
+    return run_rr(table, quantum, progress, checkpoint, resume, gantt)
+
+
+def arrival_order(table):
+    # Row indices sorted by arrival time, ties kept in table order
+    with instrument.phase("sort"):
+        return sorted(range(len(table)), key=table.arrival.__getitem__)
+
+
+def snapshot(table, gantt_chart_data, current_time, consumed, completed, queue):
+    # Loop state at the top of a dispatch loop. consumed counts the rows of
+    # the arrival order taken so far, queue lists the ready rows in order.
+    queue = list(queue)
+    return {
+        "time": current_time,
+        "consumed": consumed,
+        "completed": completed,
+        "queue": queue,
+        "remaining": [table.remaining[i] for i in queue],
+        "segments": len(gantt_chart_data),
+        "last_end": gantt_chart_data[-1]["end"] if gantt_chart_data else None
+    }
+
+
+def run_fcfs(table, progress=None, checkpoint=None, resume=None, gantt=None):
+    gantt_chart_data = [] if gantt is None else gantt
+    pid, arrival, burst = table.pid, table.arrival, table.burst
+    remaining, completion = table.remaining, table.completion
+    current_time = 0
+    n = len(table)
+    completed = 0
+
+    if resume is not None:
+        gantt_chart_data = resume["gantt"]
+        current_time = resume["time"]
+        completed = resume["consumed"]
+        order = resume["order"]
+    else:
+        order = arrival_order(table)
+    next_checkpoint = completed
+
+    for i in order[completed:]:
+        if checkpoint is not None and completed >= next_checkpoint:
+            checkpoint(snapshot(table, gantt_chart_data, current_time, completed, completed, ()))
+            next_checkpoint = completed + CHECKPOINT_INTERVAL
+
+        if current_time < arrival[i]:
+            current_time = arrival[i]
+
+        # Record start and end times for Gantt chart
+        start_time = current_time
+        end_time = current_time + burst[i]
+        gantt_chart_data.append({
+            "pid": pid[i],
+            "start": start_time,
+            "end": end_time
+        })
+
+        # Update process completion time
+        completion[i] = end_time
+        remaining[i] = 0
+        current_time = end_time
+        completed += 1
+        if progress is not None and completed % PROGRESS_INTERVAL == 0:
+            progress(completed, n)
+
+    return gantt_chart_data
+
+
+def run_sjf(table, progress=None, checkpoint=None, resume=None, gantt=None):
+    # Shortest burst first; ties go to the earlier arrival, then lower PID
+    remaining, arrival, pid = table.remaining, table.arrival, table.pid
+    return run_non_preemptive(table, lambda i: (remaining[i], arrival[i], pid[i]),
+                              progress, checkpoint, resume, gantt)
+
+
+def run_priority(table, progress=None, checkpoint=None, resume=None, gantt=None):
+    # Lower number = higher priority; ties go to the earlier arrival, then lower PID
+    priority, arrival, pid = table.priority, table.arrival, table.pid
+    return run_non_preemptive(table, lambda i: (priority[i], arrival[i], pid[i]),
+                              progress, checkpoint, resume, gantt)
+
+
+def run_non_preemptive(table, key, progress=None, checkpoint=None, resume=None, gantt=None):
+    # Shared dispatcher for SJF and Priority. Arrivals are consumed in
+    # arrival order and pushed onto a heap keyed by key(row), so each
+    # dispatch costs O(log n) instead of a rescan and sort of every process.
+    gantt_chart_data = [] if gantt is None else gantt
+    pid, arrival = table.pid, table.arrival
+    remaining, completion = table.remaining, table.completion
+    ready_heap = []
+    current_time = 0
+    completed = 0
+    k = 0
+
+    if resume is not None:
+        gantt_chart_data = resume["gantt"]
+        current_time = resume["time"]
+        completed = resume["completed"]
+        k = resume["consumed"]
+        order = resume["order"]
+        ready_heap = [(key(i), i) for i in resume["queue"]]
+        heapq.heapify(ready_heap)
+    else:
+        order = arrival_order(table)
+    n = len(order)
+    next_checkpoint = completed
+
+    while k < n or ready_heap:
+        if checkpoint is not None and completed >= next_checkpoint:
+            checkpoint(snapshot(table, gantt_chart_data, current_time, k, completed,
+                                (i for _, i in ready_heap)))
+            next_checkpoint = completed + max(CHECKPOINT_INTERVAL, len(ready_heap))
+
+        # Add arrived processes to ready queue
+        while k < n and arrival[order[k]] <= current_time:
+            i = order[k]
+            heapq.heappush(ready_heap, (key(i), i))
+            k += 1
+
+        if not ready_heap:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrival[order[k]]
+            continue
+
+        _, i = heapq.heappop(ready_heap)
+
+        # Record start and end times for Gantt chart
+        start_time = current_time
+        end_time = current_time + remaining[i]
+        gantt_chart_data.append({
+            "pid": pid[i],
+            "start": start_time,
+            "end": end_time
+        })
+
+        # Update process completion time
+        completion[i] = end_time
+        remaining[i] = 0
+        current_time = end_time
+        completed += 1
+        if progress is not None and completed % PROGRESS_INTERVAL == 0:
+            progress(completed, n)
+
+    return gantt_chart_data
+
+
+def run_srtf(table, progress=None, checkpoint=None, resume=None, gantt=None):
+    # Event-driven SRTF: the running process can only be preempted by an
+    # arrival, so jump straight to the next arrival or completion instead
+    # of stepping one time unit at a time. Ties are broken by row index.
+    gantt_chart_data = [] if gantt is None else gantt
+    pid, arrival = table.pid, table.arrival
+    remaining, completion = table.remaining, table.completion
+    ready_heap = []
+    current_time = 0
+    completed = 0
+    dispatches = 0
+    k = 0
+
+    if resume is not None:
+        gantt_chart_data = resume["gantt"]
+        current_time = resume["time"]
+        completed = resume["completed"]
+        k = resume["consumed"]
+        order = resume["order"]
+        ready_heap = [(remaining[i], i) for i in resume["queue"]]
+        heapq.heapify(ready_heap)
+    else:
+        order = arrival_order(table)
+    n = len(order)
+    next_checkpoint = 0
+
+    while completed < n:
+        if checkpoint is not None and dispatches >= next_checkpoint:
+            checkpoint(snapshot(table, gantt_chart_data, current_time, k, completed,
+                                (i for _, i in ready_heap)))
+            next_checkpoint = dispatches + max(CHECKPOINT_INTERVAL, len(ready_heap))
+        dispatches += 1
+        if progress is not None and dispatches % PROGRESS_DISPATCHES == 0:
+            progress(completed, n)
+
+        # Add arrived processes to the ready heap
+        while k < n and arrival[order[k]] <= current_time:
+            i = order[k]
+            heapq.heappush(ready_heap, (remaining[i], i))
+            k += 1
+
+        if not ready_heap:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrival[order[k]]
+            continue
+
+        _, i = heapq.heappop(ready_heap)
+
+        # Run until completion or the next arrival, whichever comes first
+        run_until = current_time + remaining[i]
+        if k < n and arrival[order[k]] < run_until:
+            run_until = arrival[order[k]]
+
+        # Extend the current Gantt entry if the same process keeps the CPU
+        last = gantt_chart_data[-1] if gantt_chart_data else None
+        if last and last["pid"] == pid[i] and last["end"] == current_time:
+            last["end"] = run_until
+        else:
+            gantt_chart_data.append({
+                "pid": pid[i],
+                "start": current_time,
+                "end": run_until
+            })
+
+        remaining[i] -= run_until - current_time
+        current_time = run_until
+
+        # If process completed
+        if remaining[i] == 0:
+            completion[i] = current_time
+            completed += 1
+            if progress is not None and completed % PROGRESS_INTERVAL == 0:
+                progress(completed, n)
+        else:
+            heapq.heappush(ready_heap, (remaining[i], i))
+
+    return gantt_chart_data
+
+
+def run_rr(table, quantum, progress=None, checkpoint=None, resume=None, gantt=None):
+    gantt_chart_data = [] if gantt is None else gantt
+    pid, arrival = table.pid, table.arrival
+    remaining, completion = table.remaining, table.completion
+    ready_queue = deque()
+    current_time = 0
+    completed = 0
+    dispatches = 0
+    k = 0
+
+    if resume is not None:
+        gantt_chart_data = resume["gantt"]
+        current_time = resume["time"]
+        completed = resume["completed"]
+        k = resume["consumed"]
+        order = resume["order"]
+        ready_queue.extend(resume["queue"])
+    else:
+        # Sort processes by arrival time initially
+        order = arrival_order(table)
+    n = len(order)
+    next_checkpoint = 0
+
+    while completed < n:
+        if checkpoint is not None and dispatches >= next_checkpoint:
+            checkpoint(snapshot(table, gantt_chart_data, current_time, k, completed, ready_queue))
+            next_checkpoint = dispatches + max(CHECKPOINT_INTERVAL, len(ready_queue))
+        dispatches += 1
+        if progress is not None and dispatches % PROGRESS_DISPATCHES == 0:
+            progress(completed, n)
+
+        # Add arrived processes to ready queue
+        while k < n and arrival[order[k]] <= current_time:
+            ready_queue.append(order[k])
+            k += 1
+
+        if not ready_queue:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrival[order[k]]
+            continue
+
+        i = ready_queue.popleft()
+
+        # Determine execution time (minimum of quantum or remaining time)
+        exec_time = min(quantum, remaining[i])
+
+        # Record start and end times for Gantt chart
+        start_time = current_time
+        end_time = current_time + exec_time
+        gantt_chart_data.append({
+            "pid": pid[i],
+            "start": start_time,
+            "end": end_time
+        })
+
+        # Update process remaining time
+        remaining[i] -= exec_time
+        current_time = end_time
+
+        # If process completed
+        if remaining[i] == 0:
+            completion[i] = current_time
+            completed += 1
+            if progress is not None and completed % PROGRESS_INTERVAL == 0:
+                progress(completed, n)
+        else:
+            # Add arrived processes while this process was executing
+            while k < n and arrival[order[k]] <= current_time:
+                ready_queue.append(order[k])
+                k += 1
+            # Add the current process back to queue
+            ready_queue.append(i)
+
+    return gantt_chart_data
+
+
+def run_mlfq(table, quanta=(2, 4, 8), aging=None, progress=None, gantt=None):
+    # Multilevel feedback queue. Level l is a FIFO with time slice quanta[l];
+    # new processes enter level 0, a process that uses its whole slice moves
+    # down a level, and one preempted by a new arrival (only possible below
+    # level 0) keeps its level. A process that has waited aging time units in
+    # a lower level moves up one level; aging=None disables it. With a single
+    # level this is exactly Round Robin.
+    gantt_chart_data = [] if gantt is None else gantt
+    pid, arrival = table.pid, table.arrival
+    remaining, completion = table.remaining, table.completion
+    order = arrival_order(table)
+    levels = len(quanta)
+    queues = [deque() for _ in range(levels)]  # (row, time it joined the level)
+    current_time = 0
+    completed = 0
+    dispatches = 0
+    n = len(order)
+    k = 0
+
+    while completed < n:
+        dispatches += 1
+        if progress is not None and dispatches % PROGRESS_DISPATCHES == 0:
+            progress(completed, n)
+
+        # Add arrived processes to the top level
+        while k < n and arrival[order[k]] <= current_time:
+            queues[0].append((order[k], arrival[order[k]]))
+            k += 1
+
+        # Aging - promote processes that waited too long in a lower level
+        if aging is not None:
+            for level in range(1, levels):
+                queue = queues[level]
+                while queue and current_time - queue[0][1] >= aging:
+                    i, _ = queue.popleft()
+                    queues[level - 1].append((i, current_time))
+
+        level = next((level for level in range(levels) if queues[level]), None)
+        if level is None:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrival[order[k]]
+            continue
+
+        i, _ = queues[level].popleft()
+
+        # Run for the level's slice; below the top level a new arrival preempts
+        end_time = current_time + min(quanta[level], remaining[i])
+        preempted = False
+        if level > 0 and k < n and arrival[order[k]] < end_time:
+            end_time = arrival[order[k]]
+            preempted = True
+
+        gantt_chart_data.append({
+            "pid": pid[i],
+            "start": current_time,
+            "end": end_time
+        })
+        remaining[i] -= end_time - current_time
+        current_time = end_time
+
+        if remaining[i] == 0:
+            completion[i] = current_time
+            completed += 1
+            if progress is not None and completed % PROGRESS_INTERVAL == 0:
+                progress(completed, n)
+        else:
+            # Add arrived processes while this process was executing
+            while k < n and arrival[order[k]] <= current_time:
+                queues[0].append((order[k], arrival[order[k]]))
+                k += 1
+            if not preempted:
+                level = min(level + 1, levels - 1)
+            queues[level].append((i, current_time))
+
+    return gantt_chart_data
+
+
+def cfs_weight(nice):
+    # Load weight for a nice value (priority column, clamped to -20..19);
+    # each nice level is worth about 25% CPU, as in Linux
+    nice = max(-20, min(19, nice))
+    return NICE_0_WEIGHT / 1.25 ** nice
+
+
+def run_cfs(table, granularity=2, latency=None, progress=None, gantt=None):
+    # CFS-style fair scheduler. Runnable processes sit in a heap ordered by
+    # virtual runtime (CPU time scaled by NICE_0_WEIGHT / weight, weight from
+    # the priority column used as a nice value); the one with the smallest
+    # vruntime runs next for its weighted share of latency, but at least
+    # granularity. New processes start at the queue's min_vruntime, and an
+    # arrival preempts the running process once it is more than granularity
+    # of vruntime ahead of min_vruntime.
+    gantt_chart_data = [] if gantt is None else gantt
+    pid, arrival, priority = table.pid, table.arrival, table.priority
+    remaining, completion = table.remaining, table.completion
+    if latency is None:
+        latency = CFS_LATENCY_FACTOR * granularity
+    order = arrival_order(table)
+    n = len(order)
+    weight = [cfs_weight(priority[i]) for i in range(n)]
+    vruntime = [0.0] * n
+    tree = []  # (vruntime, seq, row)
+    total_weight = 0.0
+    min_vruntime = 0.0
+    current_time = 0
+    completed = 0
+    dispatches = 0
+    seq = 0
+    k = 0
+
+    while completed < n:
+        dispatches += 1
+        if progress is not None and dispatches % PROGRESS_DISPATCHES == 0:
+            progress(completed, n)
+
+        # New processes start at min_vruntime so they can't starve the others
+        while k < n and arrival[order[k]] <= current_time:
+            i = order[k]
+            vruntime[i] = min_vruntime
+            heapq.heappush(tree, (vruntime[i], seq, i))
+            total_weight += weight[i]
+            seq += 1
+            k += 1
+
+        if not tree:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrival[order[k]]
+            continue
+
+        vr, _, i = heapq.heappop(tree)
+        total_weight -= weight[i]
+        min_vruntime = max(min_vruntime, vr)
+
+        # Weighted share of the latency period among the runnable processes
+        share = latency * weight[i] / (total_weight + weight[i])
+        end_time = current_time + min(max(granularity, math.ceil(share)), remaining[i])
+
+        # Wakeup preemption: the first arrival after the running process has
+        # pulled granularity ahead of min_vruntime takes the CPU
+        cross_time = current_time + (min_vruntime + granularity - vr) * weight[i] / NICE_0_WEIGHT
+        j = k
+        while j < n and arrival[order[j]] < end_time:
+            if arrival[order[j]] >= cross_time:
+                end_time = arrival[order[j]]
+                break
+            j += 1
+
+        gantt_chart_data.append({
+            "pid": pid[i],
+            "start": current_time,
+            "end": end_time
+        })
+        ran = end_time - current_time
+        remaining[i] -= ran
+        vruntime[i] = vr + ran * NICE_0_WEIGHT / weight[i]
+        current_time = end_time
+
+        if remaining[i] == 0:
+            completion[i] = current_time
+            completed += 1
+            if progress is not None and completed % PROGRESS_INTERVAL == 0:
+                progress(completed, n)
+        else:
+            # Arrivals during the slice join before the process is reinserted
+            while k < n and arrival[order[k]] <= current_time:
+                j = order[k]
+                vruntime[j] = min_vruntime
+                heapq.heappush(tree, (vruntime[j], seq, j))
+                total_weight += weight[j]
+                seq += 1
+                k += 1
+            heapq.heappush(tree, (vruntime[i], seq, i))
+            total_weight += weight[i]
+            seq += 1
+
+    return gantt_chart_data
+
+
+def calculate_metrics(table):
+    # Fill in the turnaround/waiting columns and return the averages
+    total_waiting = 0
+    total_turnaround = 0
+    arrival, burst, completion = table.arrival, table.burst, table.completion
+    waiting, turnaround = table.waiting, table.turnaround
+
+    for i in range(len(table)):
+        turnaround[i] = completion[i] - arrival[i]
+        waiting[i] = turnaround[i] - burst[i]
+        total_waiting += waiting[i]
+        total_turnaround += turnaround[i]
+
+    n = len(table)
+    return {
+        "avg_waiting": total_waiting / n if n else 0,
+        "avg_turnaround": total_turnaround / n if n else 0
+    }
@@ -0,0 +1,147 @@
+# Binary Gantt chart log.
+#
+# A list of Gantt chart dicts costs a few hundred bytes per segment, which RR
+# with a small quantum over a big trace turns into tens of gigabytes. A
+# segment log is an append-only file of fixed-width (pid, start, end) records
+# - three little-endian int64s, 24 bytes each - after an 8-byte header. The
+# schedulers stream into it while they run:
+#
+#     with SegmentWriter("rr.seg") as log:
+#         results, _, metrics = simulate(processes, "RR", 1, gantt=log)
+#
+# and SegmentLog memory-maps it for analysis without loading it:
+#
+#     with SegmentLog("rr.seg") as log:
+#         pid, start, end = log.columns()          # zero-copy NumPy views
+#         visible = log.segments(10000, 20000)     # dicts for one time window
+#
+# Views may outlive the with block; the file stays mapped until they are gone.
+#
+# Records are written in schedule order, so start and end are both sorted for
+# a single-CPU schedule and time windows are found by binary search.
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b"SEGLOG1\0"
+RECORD = struct.Struct("<qqq")
+SEGMENT_DTYPE = np.dtype([("pid", "<i8"), ("start", "<i8"), ("end", "<i8")])
+
+# Records packed per write call
+WRITE_BATCH = 4096
+
+
+class SegmentWriter:
+    # List-like Gantt chart sink for the schedulers. The newest entry is kept
+    # in memory until the next one arrives, because SRTF extends the last
+    # segment in place through gantt_chart_data[-1].
+    def __init__(self, path, append=False):
+        self.path = path
+        if append:
+            self.file = open(path, "r+b")
+            if self.file.read(len(MAGIC)) != MAGIC:
+                self.file.close()
+                raise ValueError(f"Not a segment log: {path}")
+            # Drop a partial record left by an interrupted writer
+            self.count = (self.file.seek(0, 2) - len(MAGIC)) // RECORD.size
+            self.file.truncate(len(MAGIC) + self.count * RECORD.size)
+            self.file.seek(0, 2)
+        else:
+            self.file = open(path, "wb")
+            self.file.write(MAGIC)
+            self.count = 0
+        self.buffer = bytearray()
+        self.pending = 0
+        self.last = None
+
+    def append(self, entry):
+        if self.last is not None:
+            self.buffer += RECORD.pack(self.last["pid"], self.last["start"], self.last["end"])
+            self.pending += 1
+            if self.pending >= WRITE_BATCH:
+                self.flush_buffer()
+        self.last = entry
+        self.count += 1
+
+    def __getitem__(self, index):
+        if index != -1 or self.last is None:
+            raise IndexError("Only the last segment of a SegmentWriter can be read")
+        return self.last
+
+    def __len__(self):
+        return self.count
+
+    def flush_buffer(self):
+        self.file.write(self.buffer)
+        self.buffer = bytearray()
+        self.pending = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.last is not None:
+            self.buffer += RECORD.pack(self.last["pid"], self.last["start"], self.last["end"])
+            self.last = None
+        self.flush_buffer()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_segments(path, gantt_chart_data):
+    # Save an existing Gantt chart list as a segment log
+    with SegmentWriter(path) as log:
+        for entry in gantt_chart_data:
+            log.append(entry)
+
+
+class SegmentLog:
+    # Read-only memory-mapped view of a segment log
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a segment log: {path}")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = (len(self.map) - len(MAGIC)) // RECORD.size
+        self.records = np.frombuffer(self.map, dtype=SEGMENT_DTYPE, count=self.count,
+                                     offset=len(MAGIC))
+
+    def columns(self):
+        # (pid, start, end) arrays viewing the mapped file
+        return self.records["pid"], self.records["start"], self.records["end"]
+
+    def window(self, start=None, end=None):
+        # Records overlapping [start, end), as a view; assumes one CPU
+        first = 0 if start is None else np.searchsorted(self.records["end"], start, side="right")
+        last = self.count if end is None else np.searchsorted(self.records["start"], end, side="left")
+        return self.records[first:max(first, last)]
+
+    def segments(self, start=None, end=None):
+        # Gantt chart dicts, optionally limited to the window [start, end)
+        records = self.window(start, end)
+        return [{"pid": int(pid), "start": int(s), "end": int(e)} for pid, s, e in records.tolist()]
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        # Views from columns() and window() stay usable after this; while any
+        # is alive the map can't be closed, and is unmapped when the last one
+        # is garbage collected instead
+        self.records = None
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+        self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
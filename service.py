@@ -0,0 +1,302 @@
+# Local HTTP/JSON simulation service.
+#
+# An asyncio server on 127.0.0.1 that runs the scheduler engine for other
+# programs. Jobs go to a bounded pool of worker processes; once
+# max_pending jobs are queued or running, new submissions get a 503 with
+# Retry-After instead of piling up:
+#
+#     python service.py --port 8080 --workers 4 --max-pending 64
+#
+#     curl -s localhost:8080/simulate -d '{"algorithm": "RR", "quantum": 2,
+#         "processes": [{"pid": 1, "arrival": 0, "burst": 5, "priority": 0}]}'
+#
+# Endpoints:
+#   POST /simulate  one job; the response is NDJSON: {"segments": [...]}
+#                   lines, then {"results": [...]} lines, then {"metrics": {...}}
+#   POST /batch     {"jobs": [job, ...]}; one NDJSON line per job, in the order
+#                   the jobs finish: {"job": index, "metrics": {...}} or
+#                   {"job": index, "error": "..."}
+#   GET  /health    pool size and the number of pending jobs
+#
+# A job is {"processes": [...], "algorithm": ..., "quantum": ...} with process
+# dicts as for scheduler.simulate. Responses use chunked transfer encoding and
+# are written with flow control, so a slow client holds back only its own
+# response.
+from concurrent.futures import Future, ProcessPoolExecutor
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+
+import scheduler
+
+HOST = "127.0.0.1"
+
+# Largest accepted request body, and entries per NDJSON line
+MAX_BODY = 64 * 2**20
+STREAM_BATCH = 1000
+
+INT64_MIN, INT64_MAX = -2**63, 2**63 - 1
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def run_job(job, summary=False):
+    # Runs in a worker process; returns plain data that pickles cheaply. With
+    # summary, only the metrics and the number of segments come back.
+    if not isinstance(job, dict) or not isinstance(job.get("processes"), list):
+        raise ValueError("A job needs a list of processes")
+    algorithm = job.get("algorithm", "FCFS")
+    quantum = job.get("quantum", 2)
+    if not is_int64(quantum):
+        raise ValueError("Time quantum must be a positive integer")
+    processes = [parse_process(process) for process in job["processes"]]
+    if len({process["pid"] for process in processes}) != len(processes):
+        raise ValueError("Process IDs must be unique")
+    try:
+        results, gantt_chart_data, metrics = scheduler.simulate(processes, algorithm, quantum)
+    except OverflowError:
+        raise ValueError("Times in this job overflow 64-bit integers")
+    if summary:
+        return {"metrics": metrics, "segments": len(gantt_chart_data)}
+    return {
+        "segments": gantt_chart_data,
+        "results": [{"pid": results.pid[i], "completion": results.completion[i],
+                     "waiting": results.waiting[i], "turnaround": results.turnaround[i]}
+                    for i in range(len(results))],
+        "metrics": metrics
+    }
+
+
+def parse_process(process):
+    # Like traces.parse_row, but JSON values must already be integers that
+    # fit the ProcessTable columns
+    if not isinstance(process, dict):
+        raise ValueError("Each process must be an object")
+    parsed = {}
+    for field in ("pid", "arrival", "burst", "priority"):
+        value = process.get(field, 0) if field == "priority" else process.get(field)
+        if not is_int64(value):
+            raise ValueError(f"Process {field} must be a 64-bit integer (got {value!r})")
+        parsed[field] = value
+    if parsed["burst"] <= 0:
+        raise ValueError(f"Burst time must be positive (pid {parsed['pid']})")
+    return parsed
+
+
+def is_int64(value):
+    return type(value) is int and INT64_MIN <= value <= INT64_MAX
+
+
+class SimulationService:
+    def __init__(self, workers=None, max_pending=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.pending = 0
+        # Workers are started on demand; forked ones would inherit the open
+        # client sockets and keep those connections from closing
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        mp_context=multiprocessing.get_context("spawn"))
+
+    def admit(self, count):
+        # Reserve room for count jobs or refuse the request
+        if count > self.max_pending:
+            raise HTTPError(413, f"Batch of {count} jobs is over the limit of {self.max_pending}")
+        if self.pending + count > self.max_pending:
+            raise HTTPError(503, f"Too many pending jobs ({self.pending}/{self.max_pending})")
+        self.pending += count
+
+    def submit(self, job, summary=False):
+        # Start one admitted job in the pool and return an asyncio future for
+        # its output. The job counts as pending until the pool is done with
+        # it; cancelling the future (a client that disconnected) only stops a
+        # job that hasn't started yet.
+        try:
+            future = self.pool.submit(run_job, job, summary)
+        except RuntimeError as e:
+            # The pool is broken or shutting down
+            future = Future()
+            future.set_exception(e)
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self.release))
+        return asyncio.wrap_future(future)
+
+    def release(self):
+        self.pending -= 1
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, body = await read_request(reader)
+                await self.dispatch(method, path, body, writer)
+            except HTTPError as e:
+                await send_json(writer, e.status, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body, writer):
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Use GET")
+            await send_json(writer, 200, {"status": "ok", "workers": self.workers,
+                                          "pending": self.pending, "max_pending": self.max_pending})
+            return
+        if path not in ("/simulate", "/batch"):
+            raise HTTPError(404, f"No such endpoint: {path}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST")
+
+        try:
+            request = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+
+        if path == "/simulate":
+            self.admit(1)
+            try:
+                output = await self.submit(request)
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid job: {e}")
+            except Exception as e:
+                # The pool or the worker failed, not the job
+                raise HTTPError(500, f"Job failed: {e!r}")
+            await start_stream(writer)
+            for key in ("segments", "results"):
+                entries = output[key]
+                for start in range(0, len(entries), STREAM_BATCH):
+                    await send_line(writer, {key: entries[start:start + STREAM_BATCH]})
+            await send_line(writer, {"metrics": output["metrics"]})
+            await end_stream(writer)
+        else:
+            jobs = request.get("jobs") if isinstance(request, dict) else None
+            if not isinstance(jobs, list):
+                raise HTTPError(400, "A batch needs a list of jobs")
+            self.admit(len(jobs))
+            futures = [self.submit(job, summary=True) for job in jobs]
+            tasks = [asyncio.ensure_future(indexed(i, future)) for i, future in enumerate(futures)]
+            try:
+                await start_stream(writer)
+                for task in asyncio.as_completed(tasks):
+                    await send_line(writer, await task)
+                await end_stream(writer)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def indexed(index, future):
+    # The NDJSON line for job index of a batch
+    try:
+        output = await future
+    except ValueError as e:
+        return {"job": index, "error": str(e)}
+    except Exception as e:
+        return {"job": index, "error": f"Job failed: {e!r}"}
+    return {"job": index, **output}
+
+
+async def read_request(reader):
+    # Parse one HTTP/1.1 request; returns (method, path, body bytes)
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "Request headers too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY:
+        raise HTTPError(413, f"Request body over {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], body
+
+
+def status_line(status):
+    return f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+
+
+async def send_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    head = status_line(status) + "Content-Type: application/json\r\n"
+    if status == 503:
+        head += "Retry-After: 1\r\n"
+    head += f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+
+async def start_stream(writer):
+    writer.write((status_line(200) + "Content-Type: application/x-ndjson\r\n"
+                  "Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n").encode())
+    await writer.drain()
+
+
+async def send_line(writer, payload):
+    # One NDJSON line as one chunk; drain waits while the client is behind
+    data = json.dumps(payload).encode() + b"\n"
+    writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+    await writer.drain()
+
+
+async def end_stream(writer):
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def serve(port=8080, workers=None, max_pending=64):
+    service = SimulationService(workers, max_pending)
+    server = await asyncio.start_server(service.handle, HOST, port)
+    print(f"Serving on http://{HOST}:{port} with {service.workers} workers", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the schedulers over HTTP on localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-pending", type=int, default=64,
+                        help="jobs queued or running before requests are refused")
+    args = parser.parse_args(argv)
+    if not 0 <= args.port <= 65535:
+        parser.error("--port must be between 0 and 65535")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be a positive integer")
+    if args.max_pending <= 0:
+        parser.error("--max-pending must be a positive integer")
+    try:
+        asyncio.run(serve(args.port, args.workers, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+# Multi-core (SMP) scheduling.
+#
+# Event-driven simulation of N identical CPUs for the five classic algorithms in
+# scheduler.py. Processes wait either in one global ready queue shared by all
+# cores, or in per-core ready queues where arrivals go to the least-loaded
+# core and an idle core with an empty queue steals work from the busiest one:
+#
+#     from smp import simulate_smp
+#     results, gantt_chart_data, metrics = simulate_smp(processes, "SRTF", cpus=32)
+#
+# Gantt chart entries carry an extra "cpu" key giving the core (lane) they ran
+# on. With cpus=1 the schedule matches scheduler.simulate exactly.
+#
+# This is also the engine for overhead modeling, on any number of cores:
+#
+#     simulate_smp(processes, "RR", 2, cpus=1, switch_cost=1,
+#                  io_bursts={7: (3, 10, 2)})
+#
+# switch_cost is the time a core spends loading a process other than the one
+# it ran last. io_bursts maps a PID to alternating CPU and I/O burst lengths,
+# starting and ending with CPU; the process blocks for each I/O burst (devices
+# are not contended) and then rejoins the ready queue, and its burst column
+# becomes its total CPU time. FCFS then orders by the time a process last
+# became ready, and SJF and SRTF by the current CPU burst. The metrics gain "switches", "switch_time", "io_time",
+# "utilization" and "lost_utilization" (fraction of core time spent switching)
+# and waiting time excludes time blocked on I/O.
+import heapq
+
+import instrument
+from process_table import ProcessTable
+import scheduler
+
+
+def simulate_smp(processes, algorithm="FCFS", quantum=2, cpus=2, per_core_queues=False,
+                 work_stealing=True, progress=None, switch_cost=0, io_bursts=None):
+    # Like scheduler.simulate, on cpus cores
+    scheduler.check_algorithm(algorithm, quantum)
+    if algorithm not in scheduler.CLASSIC_ALGORITHMS:
+        raise ValueError(f"{algorithm} is not supported on multiple CPUs "
+                         "or with context switch and I/O modeling")
+    if cpus <= 0:
+        raise ValueError("Number of CPUs must be a positive integer")
+    if switch_cost < 0:
+        raise ValueError("Context switch cost must not be negative")
+
+    with instrument.phase("prepare"):
+        if isinstance(processes, ProcessTable):
+            results = processes.copy()
+            results.reset()
+        else:
+            results = ProcessTable.from_dicts(processes)
+        phases = burst_phases(results, io_bursts) if io_bursts else None
+
+    stats = {}
+    with instrument.phase("dispatch"):
+        gantt_chart_data = run_smp(results, algorithm, quantum, cpus, per_core_queues,
+                                   work_stealing, progress, switch_cost, phases, stats)
+    with instrument.phase("metrics"):
+        metrics = scheduler.calculate_metrics(results)
+        if switch_cost or io_bursts:
+            metrics.update(overhead_metrics(results, cpus, phases, stats))
+    instrument.record_run(results, algorithm, gantt_chart_data, cpus, stats, phases)
+    return results, gantt_chart_data, metrics
+
+
+def burst_phases(table, io_bursts):
+    # Map row -> CPU/I/O burst sequence, and set each listed process's burst
+    # and remaining columns for it
+    row = {pid: i for i, pid in enumerate(table.pid)}
+    phases = {}
+    for pid, bursts in io_bursts.items():
+        if pid not in row:
+            raise ValueError(f"I/O bursts given for unknown PID {pid}")
+        bursts = tuple(bursts)
+        if len(bursts) % 2 == 0 or any(b <= 0 for b in bursts):
+            raise ValueError(f"PID {pid} needs positive CPU/I/O bursts starting and ending with CPU")
+        i = row[pid]
+        phases[i] = bursts
+        table.burst[i] = sum(bursts[::2])
+        table.remaining[i] = bursts[0]
+    return phases
+
+
+def overhead_metrics(table, cpus, phases, stats):
+    # Utilization over the span from the first arrival to the last completion;
+    # waiting time does not count time blocked on I/O
+    arrival, completion, waiting = table.arrival, table.completion, table.waiting
+    io_time = 0
+    for i, bursts in (phases or {}).items():
+        blocked = sum(bursts[1::2])
+        waiting[i] -= blocked
+        io_time += blocked
+
+    n = len(table)
+    capacity = (max(completion) - min(arrival)) * cpus if n else 0
+    busy = sum(table.burst)
+    return {
+        "avg_waiting": sum(waiting) / n if n else 0,
+        "switches": stats["switches"],
+        "switch_time": stats["switch_time"],
+        "io_time": io_time,
+        "utilization": busy / capacity if capacity else 0,
+        "lost_utilization": stats["switch_time"] / capacity if capacity else 0
+    }
+
+
+def ready_key(table, algorithm):
+    # Ordering of the ready queue for algorithm, as key(row, seq) where seq
+    # increases with every enqueue; same tie-breaks as scheduler.py
+    pid, arrival, priority, remaining = table.pid, table.arrival, table.priority, table.remaining
+    if algorithm == "FCFS":
+        # Order of joining the ready queue, which is arrival order unless a
+        # process comes back from I/O
+        return lambda i, seq: (seq,)
+    if algorithm == "SJF":
+        return lambda i, seq: (remaining[i], arrival[i], pid[i], i)
+    if algorithm == "Priority":
+        return lambda i, seq: (priority[i], arrival[i], pid[i], i)
+    if algorithm == "SRTF":
+        return lambda i, seq: (remaining[i], i)
+    # RR: first in, first out
+    return lambda i, seq: (seq,)
+
+
+def run_smp(table, algorithm, quantum, cpus, per_core_queues=False, work_stealing=True,
+            progress=None, switch_cost=0, phases=None, stats=None):
+    # phases maps row -> CPU/I/O bursts (see burst_phases); the number of
+    # context switches and the time they took are added to stats
+    pid, arrival = table.pid, table.arrival
+    remaining, completion = table.remaining, table.completion
+    order = scheduler.arrival_order(table)
+    n = len(order)
+    key = ready_key(table, algorithm)
+    preemptive = algorithm == "SRTF"
+    sliced = algorithm == "RR"
+
+    # Ready queues are heaps of (key, row); one shared or one per core
+    queues = [[] for _ in range(cpus if per_core_queues else 1)]
+    queued = 0
+    seq = 0
+
+    # running[cpu] is [row, start, end, switch start] for the current run on
+    # that core, where start is after the context switch; events holds
+    # (end, cpu, row) and is checked against running lazily
+    running = [None] * cpus
+    events = []
+    idle = list(range(cpus))
+    gantt_chart_data = []
+
+    # Row each core ran last, processes blocked on I/O as (wake time, row),
+    # and the index of each process's current CPU burst in its phases
+    last_run = [None] * cpus
+    blocked = []
+    phase = {}
+    switches = 0
+    switch_time = 0
+
+    current_time = 0
+    completed = 0
+    steps = 0
+    k = 0
+
+    def enqueue(i, cpu=None):
+        nonlocal queued, seq
+        if per_core_queues:
+            if cpu is None:
+                # Least-loaded core, counting the process it is running
+                cpu = min(range(cpus), key=lambda c: (len(queues[c]) + (running[c] is not None), c))
+            queue = queues[cpu]
+        else:
+            queue = queues[0]
+        heapq.heappush(queue, (key(i, seq), i))
+        seq += 1
+        queued += 1
+
+    def take(cpu):
+        # Next process for cpu, stealing from the longest queue if allowed
+        nonlocal queued
+        queue = queues[cpu] if per_core_queues else queues[0]
+        if not queue and per_core_queues and work_stealing:
+            queue = max(queues, key=len)
+        if not queue:
+            return None
+        queued -= 1
+        return heapq.heappop(queue)[1]
+
+    def start(cpu, i):
+        nonlocal switches
+        begin = current_time
+        if switch_cost and last_run[cpu] is not None and last_run[cpu] != i:
+            begin += switch_cost
+            switches += 1
+        last_run[cpu] = i
+        end = begin + (min(quantum, remaining[i]) if sliced else remaining[i])
+        running[cpu] = [i, begin, end, current_time]
+        heapq.heappush(events, (end, cpu, i))
+
+    def stop(cpu):
+        # Take the process off cpu at current_time and record its segment
+        nonlocal switch_time
+        i, begin, _, switched = running[cpu]
+        running[cpu] = None
+        switch_time += min(begin, current_time) - switched
+        if current_time > begin:
+            remaining[i] -= current_time - begin
+            gantt_chart_data.append({"pid": pid[i], "start": begin, "end": current_time, "cpu": cpu})
+        return i
+
+    def left(c):
+        # Remaining time of the process running on core c at current_time
+        entry = running[c]
+        return entry[2] - max(entry[1], current_time)
+
+    while completed < n:
+        steps += 1
+        if progress is not None and steps % scheduler.PROGRESS_DISPATCHES == 0:
+            progress(completed, n)
+
+        # Finish runs that end now, in core order
+        expired = []
+        while events and events[0][0] <= current_time:
+            end, cpu, i = heapq.heappop(events)
+            entry = running[cpu]
+            if entry is None or entry[0] != i or entry[2] != end:
+                continue  # stale after a preemption
+            stop(cpu)
+            heapq.heappush(idle, cpu)
+            if remaining[i] == 0 and phases is not None and i in phases:
+                # Block on the next I/O burst unless this was the last CPU burst
+                bursts = phases[i]
+                p = phase.get(i, 0) + 2
+                if p < len(bursts):
+                    phase[i] = p
+                    remaining[i] = bursts[p]
+                    heapq.heappush(blocked, (current_time + bursts[p - 1], i))
+                    continue
+            if remaining[i] == 0:
+                completion[i] = current_time
+                completed += 1
+                if progress is not None and completed % scheduler.PROGRESS_INTERVAL == 0:
+                    progress(completed, n)
+            else:
+                expired.append((cpu, i))
+
+        # New arrivals and processes back from I/O queue ahead of processes
+        # whose RR slice just ended
+        while k < n and arrival[order[k]] <= current_time:
+            enqueue(order[k])
+            k += 1
+        while blocked and blocked[0][0] <= current_time:
+            enqueue(heapq.heappop(blocked)[1])
+        for cpu, i in expired:
+            enqueue(i, cpu)
+
+        # Hand queued work to idle cores, lowest core first
+        if queued and idle:
+            still_idle = []
+            while idle and queued:
+                cpu = heapq.heappop(idle)
+                i = take(cpu)
+                if i is None:
+                    still_idle.append(cpu)
+                else:
+                    start(cpu, i)
+            for cpu in still_idle:
+                heapq.heappush(idle, cpu)
+
+        # SRTF: a ready process with less remaining time preempts the running
+        # process with the most remaining time (on its own core if per-core)
+        if preemptive and queued:
+            if per_core_queues:
+                candidates = [(cpu,) for cpu in range(cpus) if queues[cpu] and running[cpu] is not None]
+            else:
+                candidates = [tuple(range(cpus))]
+            for cores in candidates:
+                queue = queues[cores[0]] if per_core_queues else queues[0]
+                while queue:
+                    # Remaining time of a running process is end - now
+                    victim = max((c for c in cores if running[c] is not None),
+                                 key=lambda c: (left(c), running[c][0]), default=None)
+                    if victim is None:
+                        break
+                    best_key, best = queue[0]
+                    if best_key >= (left(victim), running[victim][0]):
+                        break
+                    heapq.heappop(queue)
+                    queued -= 1
+                    enqueue(stop(victim), victim)
+                    start(victim, best)
+
+        # Advance to the next arrival or the end of the next run
+        next_time = None
+        if k < n:
+            next_time = arrival[order[k]]
+        if blocked and (next_time is None or blocked[0][0] < next_time):
+            next_time = blocked[0][0]
+        while events:
+            end, cpu, i = events[0]
+            entry = running[cpu]
+            if entry is None or entry[0] != i or entry[2] != end:
+                heapq.heappop(events)
+                continue
+            if next_time is None or end < next_time:
+                next_time = end
+            break
+        if next_time is None:
+            break
+        current_time = max(current_time, next_time)
+
+    if stats is not None:
+        stats["switches"] = stats.get("switches", 0) + switches
+        stats["switch_time"] = stats.get("switch_time", 0) + switch_time
+
+    # Segments are recorded as they end; list them by start time, then core
+    gantt_chart_data.sort(key=lambda item: (item["start"], item["cpu"]))
+    return gantt_chart_data
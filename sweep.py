@@ -0,0 +1,173 @@
+# Parallel parameter sweep.
+#
+# Runs every scheduling algorithm - RR once per time quantum - over a set of
+# workloads on a pool of worker processes and collects the results into one
+# comparison table. The workloads are handed to each worker once, when the
+# pool starts, and every task after that only names the workload it runs on:
+#
+#     python sweep.py jobs_a.csv jobs_b.jsonl --quanta 1 2 4 8 16 --workers 8
+#
+# With --switch-cost every dispatch of a different process costs that much
+# time, and the table also shows the CPU utilization that is left, so quanta
+# can be compared by real throughput. Waiting time percentiles, response
+# time and throughput come from metrics.table_metrics. With --workers 1 the sweep runs in
+# the calling process instead of a pool, which is what profiling it needs.
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import csv
+import os
+import sys
+
+from metrics import table_metrics
+from process_table import ProcessTable
+import scheduler
+import traces
+
+# Columns of the comparison table, in display order
+COLUMNS = ("workload", "algorithm", "quantum", "avg_waiting", "p95_waiting", "p99_waiting",
+           "avg_turnaround", "avg_response", "throughput", "makespan", "segments", "utilization")
+
+# Workloads shared read-only by the tasks of a worker process
+_workloads = {}
+
+
+def _init_worker(workloads):
+    _workloads.update(workloads)
+
+
+def _run_task(task):
+    name, algorithm, quantum, switch_cost = task
+    results, gantt_chart_data, metrics = scheduler.simulate(_workloads[name], algorithm, quantum,
+                                                            switch_cost=switch_cost)
+    # Percentiles and response times over all processes, vectorized
+    distribution = table_metrics(results, gantt_chart_data)
+    return {
+        "workload": name,
+        "algorithm": algorithm,
+        "quantum": quantum if algorithm in scheduler.QUANTUM_ALGORITHMS else None,
+        "avg_waiting": metrics["avg_waiting"],
+        "p95_waiting": distribution.get("p95_waiting"),
+        "p99_waiting": distribution.get("p99_waiting"),
+        "avg_turnaround": metrics["avg_turnaround"],
+        "avg_response": distribution.get("avg_response"),
+        "throughput": distribution.get("throughput"),
+        "makespan": max(results.completion, default=0),
+        "segments": len(gantt_chart_data),
+        "utilization": metrics.get("utilization")
+    }
+
+
+def sweep_tasks(workload_names, algorithms=scheduler.ALGORITHMS, quanta=(2,), switch_cost=0):
+    # Every (workload, algorithm, quantum) combination; quanta only apply to
+    # the algorithms that take one
+    tasks = []
+    for name in workload_names:
+        for algorithm in algorithms:
+            if algorithm in scheduler.QUANTUM_ALGORITHMS:
+                tasks.extend((name, algorithm, quantum, switch_cost) for quantum in quanta)
+            else:
+                tasks.append((name, algorithm, None, switch_cost))
+    return tasks
+
+
+def run_sweep(workloads, algorithms=scheduler.ALGORITHMS, quanta=(2,), workers=None, switch_cost=0):
+    # workloads maps a name to a ProcessTable or a list of process dicts.
+    # Returns one result row per run, in task order.
+    tables = {}
+    for name, processes in workloads.items():
+        if not isinstance(processes, ProcessTable):
+            processes = ProcessTable.from_dicts(processes)
+        tables[name] = processes
+
+    for quantum in quanta:
+        if quantum <= 0:
+            raise ValueError("Time quantum must be a positive integer")
+    if switch_cost < 0:
+        raise ValueError("Context switch cost must not be negative")
+    if switch_cost:
+        for algorithm in algorithms:
+            if algorithm not in scheduler.CLASSIC_ALGORITHMS:
+                raise ValueError(f"{algorithm} does not support a context switch cost")
+
+    tasks = sweep_tasks(tables, algorithms, quanta, switch_cost)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(tasks)) or 1
+
+    if workers == 1:
+        # Run in this process, so an enabled profiler sees every run
+        _init_worker(tables)
+        try:
+            return [_run_task(task) for task in tasks]
+        finally:
+            _workloads.clear()
+
+    # Hand out tasks in chunks so small runs don't pay a round trip each
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(tables,)) as pool:
+        return list(pool.map(_run_task, tasks, chunksize=chunksize))
+
+
+def load_workloads(paths):
+    # Read each trace file into a ProcessTable keyed by file name
+    workloads = {}
+    for path in paths:
+        workloads[os.path.basename(path)] = ProcessTable.from_dicts(traces.read_trace(path))
+    return workloads
+
+
+def format_table(rows):
+    # Render result rows as a fixed-width text table
+    cells = [COLUMNS]
+    for row in rows:
+        line = []
+        for column in COLUMNS:
+            value = row[column]
+            if value is None:
+                value = "-"
+            elif isinstance(value, float):
+                value = f"{value:.2f}"
+            line.append(str(value))
+        cells.append(line)
+    widths = [max(len(line[i]) for line in cells) for i in range(len(COLUMNS))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(line, widths)) for line in cells)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare scheduling algorithms across workloads")
+    parser.add_argument("traces", nargs="+", help="CSV or JSONL trace files")
+    parser.add_argument("--algorithms", nargs="+", choices=scheduler.ALGORITHMS,
+                        help="default: all, or the classic five with --switch-cost")
+    parser.add_argument("--quanta", nargs="+", type=int, default=[2], help="RR/MLFQ/CFS time quanta")
+    parser.add_argument("--switch-cost", type=int, default=0, help="context switch cost")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", help="write the table to this CSV file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if min(args.quanta) <= 0:
+        parser.error("time quanta must be positive integers")
+    if args.switch_cost < 0:
+        parser.error("--switch-cost must not be negative")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers must be a positive integer")
+    algorithms = args.algorithms
+    if algorithms is None:
+        algorithms = scheduler.CLASSIC_ALGORITHMS if args.switch_cost else scheduler.ALGORITHMS
+    elif args.switch_cost:
+        unsupported = [algorithm for algorithm in algorithms
+                       if algorithm not in scheduler.CLASSIC_ALGORITHMS]
+        if unsupported:
+            parser.error(f"--switch-cost is not supported by {', '.join(unsupported)}")
+    rows = run_sweep(load_workloads(args.traces), algorithms, args.quanta, args.workers,
+                     args.switch_cost)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        print(format_table(rows))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# Virtualized Treeview for large ProcessTables.
+#
+# A ttk.Treeview slows down badly past a few thousand items, so VirtualTable
+# only ever holds the rows currently on screen. It keeps the sorted and
+# filtered order of the table's rows as a NumPy index array and refills the
+# Treeview from the columns whenever the view scrolls:
+#
+#     view = VirtualTable(parent, ("pid", "arrival"), ("Process ID", "Arrival Time"))
+#     view.frame.pack(fill=tk.BOTH, expand=True)
+#     view.set_source(processes)
+#
+# Clicking a heading sorts by that column (again to reverse). The filter box
+# takes comma-separated conditions such as "burst > 10, priority = 0"; a bare
+# number shows the process with that PID.
+import operator
+import re
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+FILTER_OPERATORS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+CONDITION = re.compile(r"^\s*(\w+)\s*(==|!=|<=|>=|=|<|>)\s*(-?\d+)\s*$")
+
+
+def parse_filter(text, columns):
+    # Turn filter text into a list of (column, operator, value)
+    conditions = []
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        if part.strip().lstrip("-").isdigit():
+            conditions.append(("pid", operator.eq, int(part)))
+            continue
+        match = CONDITION.match(part)
+        if match is None or match.group(1) not in columns:
+            raise ValueError(f"Invalid filter: {part.strip()}")
+        conditions.append((match.group(1), FILTER_OPERATORS[match.group(2)], int(match.group(3))))
+    return conditions
+
+
+def column_values(table, column):
+    # Copy of a column as an int64 array; a view would stop the table's
+    # array from growing while it is alive
+    return np.array(getattr(table, column), dtype=np.int64)
+
+
+def view_order(table, sort_column=None, descending=False, conditions=()):
+    # Row indices of table, sorted and filtered
+    n = len(table)
+    if sort_column is None:
+        order = np.arange(n)
+    else:
+        values = column_values(table, sort_column)
+        order = np.argsort(-values if descending else values, kind="stable")
+    if conditions:
+        mask = np.ones(n, dtype=bool)
+        for column, compare, value in conditions:
+            mask &= compare(column_values(table, column), value)
+        order = order[mask[order]]
+    return order
+
+
+class VirtualTable:
+    def __init__(self, parent, columns, headings, height=10):
+        self.columns = columns
+        self.table = None
+        self.order = np.arange(0)
+        self.first = 0
+        self.sort_column = "pid"
+        self.descending = False
+        self.conditions = []
+
+        self.frame = ttk.Frame(parent)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(1, weight=1)
+
+        filter_frame = ttk.Frame(self.frame)
+        filter_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        self.filter_entry = ttk.Entry(filter_frame)
+        self.filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.filter_entry.bind("<Return>", lambda event: self.apply_filter())
+        self.status_label = ttk.Label(filter_frame, text="")
+        self.status_label.pack(side=tk.LEFT)
+
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height)
+        for column, heading in zip(columns, headings):
+            self.tree.heading(column, text=heading, command=lambda c=column: self.sort(c))
+            self.tree.column(column, width=80, anchor="center")
+        self.tree.grid(row=1, column=0, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(1))
+
+    def page_size(self):
+        return int(self.tree.cget("height"))
+
+    def set_source(self, table):
+        # Show table, keeping the current sort and filter
+        self.table = table
+        self.refresh()
+
+    def clear(self):
+        self.table = None
+        self.refresh()
+
+    def refresh(self, keep_position=True):
+        # Recompute the row order after the table changed
+        if self.table is None:
+            self.order = np.arange(0)
+        else:
+            self.order = view_order(self.table, self.sort_column, self.descending, self.conditions)
+        if not keep_position:
+            self.first = 0
+        self.render()
+
+    def sort(self, column):
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column, self.descending = column, False
+        self.refresh(keep_position=False)
+
+    def apply_filter(self):
+        try:
+            self.conditions = parse_filter(self.filter_entry.get(), self.columns)
+        except ValueError as e:
+            self.status_label.config(text=str(e))
+            return
+        self.refresh(keep_position=False)
+
+    def on_scroll(self, action, amount, unit=None):
+        # Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"/"pages")
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.order))
+            self.render()
+        elif unit == "pages":
+            self.scroll(int(amount) * self.page_size())
+        else:
+            self.scroll(int(amount))
+
+    def scroll(self, rows):
+        self.first += rows
+        self.render()
+
+    def render(self):
+        # Fill the Treeview with the visible page of rows only; item IDs are
+        # the table row indices
+        total = len(self.order)
+        page = self.page_size()
+        self.first = max(0, min(self.first, total - page))
+        self.tree.delete(*self.tree.get_children())
+
+        visible = self.order[self.first:self.first + page].tolist()
+        columns = [getattr(self.table, column) for column in self.columns] if visible else []
+        for i in visible:
+            self.tree.insert("", tk.END, iid=str(i), values=[values[i] for values in columns])
+
+        if total:
+            self.scrollbar.set(self.first / total, min(self.first + page, total) / total)
+            self.status_label.config(
+                text=f"{self.first + 1}-{self.first + len(visible)} of {total}"
+                     + (f" (filtered from {len(self.table)})" if total != len(self.table) else ""))
+        else:
+            self.scrollbar.set(0, 1)
+            self.status_label.config(text="")
+
+    def selected_rows(self):
+        # Table row indices of the selected (visible) items
+        return [int(item) for item in self.tree.selection()]
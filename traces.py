@@ -0,0 +1,229 @@
+# Streaming trace replay.
+#
+# Reads arrival-sorted job traces from CSV or JSONL one row at a time and runs
+# them through generator versions of the schedulers, so memory is bounded by
+# the ready queue rather than by the length of the trace:
+#
+#     from traces import read_trace, replay
+#     metrics = replay(read_trace("jobs.csv"), "RR", quantum=4)
+#
+# CSV traces need a header row with pid, arrival and burst columns (priority
+# is optional and defaults to 0); JSONL traces hold one object per line with
+# the same keys.
+from collections import deque
+import csv
+import heapq
+import json
+
+from scheduler import CLASSIC_ALGORITHMS
+
+
+def read_trace(path):
+    # Yield process dicts from a .csv or .jsonl/.ndjson trace file
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                yield parse_row(row)
+    elif path.endswith((".jsonl", ".ndjson")):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield parse_row(json.loads(line))
+    else:
+        raise ValueError(f"Unsupported trace format: {path}")
+
+
+def parse_row(row):
+    process = {
+        "pid": int(row["pid"]),
+        "arrival": int(row["arrival"]),
+        "burst": int(row["burst"]),
+        "priority": int(row.get("priority") or 0)
+    }
+    if process["burst"] <= 0:
+        raise ValueError(f"Burst time must be positive (pid {process['pid']})")
+    return process
+
+
+class Arrivals:
+    # One-item lookahead over an arrival-sorted process stream
+    def __init__(self, processes):
+        self.processes = iter(processes)
+        self.seq = 0
+        self.next = None
+        self.advance()
+
+    def advance(self):
+        process = next(self.processes, None)
+        if process is not None:
+            if self.next is not None and process["arrival"] < self.next["arrival"]:
+                raise ValueError(f"Trace is not sorted by arrival time (pid {process['pid']})")
+            # Work on a copy and remember the trace position for tie-breaks
+            process = dict(process, remaining=process["burst"], seq=self.seq)
+            self.seq += 1
+        self.next = process
+
+    def pop_arrived(self, current_time):
+        # Yield every process that has arrived by current_time
+        while self.next is not None and self.next["arrival"] <= current_time:
+            process = self.next
+            self.advance()
+            yield process
+
+
+def finish(process, completion):
+    # Build the completed-process record returned to the caller
+    turnaround = completion - process["arrival"]
+    return {
+        "pid": process["pid"],
+        "arrival": process["arrival"],
+        "burst": process["burst"],
+        "priority": process["priority"],
+        "completion": completion,
+        "waiting": turnaround - process["burst"],
+        "turnaround": turnaround
+    }
+
+
+def stream_schedule(processes, algorithm="FCFS", quantum=2):
+    # Generator over (segment, finished) pairs for an arrival-sorted process
+    # stream. segment is a Gantt chart entry; finished is the completed
+    # process record when the segment completes a process, otherwise None.
+    if algorithm not in CLASSIC_ALGORITHMS:
+        raise ValueError(f"Streaming is not supported for scheduling algorithm: {algorithm}")
+    if algorithm == "RR" and quantum <= 0:
+        raise ValueError("Time quantum must be a positive integer")
+
+    arrivals = Arrivals(processes)
+    if algorithm == "FCFS":
+        return stream_fcfs(arrivals)
+    if algorithm == "SJF":
+        return stream_non_preemptive(arrivals, lambda p: (p["burst"], p["arrival"], p["pid"]))
+    if algorithm == "Priority":
+        return stream_non_preemptive(arrivals, lambda p: (p["priority"], p["arrival"], p["pid"]))
+    if algorithm == "SRTF":
+        return stream_srtf(arrivals)
+    return stream_rr(arrivals, quantum)
+
+
+def stream_fcfs(arrivals):
+    current_time = 0
+    while arrivals.next is not None:
+        process = arrivals.next
+        arrivals.advance()
+        if current_time < process["arrival"]:
+            current_time = process["arrival"]
+        end_time = current_time + process["burst"]
+        yield {"pid": process["pid"], "start": current_time, "end": end_time}, finish(process, end_time)
+        current_time = end_time
+
+
+def stream_non_preemptive(arrivals, key):
+    ready_heap = []
+    current_time = 0
+    while arrivals.next is not None or ready_heap:
+        for process in arrivals.pop_arrived(current_time):
+            heapq.heappush(ready_heap, (key(process), process["seq"], process))
+
+        if not ready_heap:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrivals.next["arrival"]
+            continue
+
+        _, _, process = heapq.heappop(ready_heap)
+        end_time = current_time + process["burst"]
+        yield {"pid": process["pid"], "start": current_time, "end": end_time}, finish(process, end_time)
+        current_time = end_time
+
+
+def stream_srtf(arrivals):
+    ready_heap = []
+    current_time = 0
+    segment = None
+    while arrivals.next is not None or ready_heap:
+        for process in arrivals.pop_arrived(current_time):
+            heapq.heappush(ready_heap, (process["remaining"], process["seq"], process))
+
+        if not ready_heap:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrivals.next["arrival"]
+            continue
+
+        remaining, seq, process = heapq.heappop(ready_heap)
+
+        # Run until completion or the next arrival, whichever comes first
+        run_until = current_time + remaining
+        if arrivals.next is not None and arrivals.next["arrival"] < run_until:
+            run_until = arrivals.next["arrival"]
+
+        # Hold the open segment back until the process loses the CPU
+        if segment and segment["pid"] != process["pid"]:
+            yield segment, None
+            segment = None
+        if segment is None:
+            segment = {"pid": process["pid"], "start": current_time, "end": run_until}
+        else:
+            segment["end"] = run_until
+
+        process["remaining"] -= run_until - current_time
+        current_time = run_until
+
+        if process["remaining"] == 0:
+            yield segment, finish(process, current_time)
+            segment = None
+        else:
+            heapq.heappush(ready_heap, (process["remaining"], seq, process))
+
+
+def stream_rr(arrivals, quantum):
+    ready_queue = deque()
+    current_time = 0
+    while arrivals.next is not None or ready_queue:
+        ready_queue.extend(arrivals.pop_arrived(current_time))
+
+        if not ready_queue:
+            # CPU idle - fast-forward to the next arrival
+            current_time = arrivals.next["arrival"]
+            continue
+
+        process = ready_queue.popleft()
+        exec_time = min(quantum, process["remaining"])
+        segment = {"pid": process["pid"], "start": current_time, "end": current_time + exec_time}
+        process["remaining"] -= exec_time
+        current_time += exec_time
+
+        if process["remaining"] == 0:
+            yield segment, finish(process, current_time)
+        else:
+            # Processes that arrived during the slice queue ahead of it
+            ready_queue.extend(arrivals.pop_arrived(current_time))
+            ready_queue.append(process)
+            yield segment, None
+
+
+def replay(processes, algorithm="FCFS", quantum=2, on_segment=None, on_finish=None):
+    # Run a process stream to completion keeping only running totals.
+    # on_segment/on_finish, if given, are called with each Gantt entry and
+    # each completed process record as they are produced.
+    count = 0
+    total_waiting = 0
+    total_turnaround = 0
+    makespan = 0
+    for segment, finished in stream_schedule(processes, algorithm, quantum):
+        if on_segment is not None:
+            on_segment(segment)
+        if finished is None:
+            continue
+        if on_finish is not None:
+            on_finish(finished)
+        count += 1
+        total_waiting += finished["waiting"]
+        total_turnaround += finished["turnaround"]
+        makespan = max(makespan, finished["completion"])
+
+    return {
+        "count": count,
+        "avg_waiting": total_waiting / count if count else 0,
+        "avg_turnaround": total_turnaround / count if count else 0,
+        "makespan": makespan
+    }
@@ -0,0 +1,153 @@
+# Synthetic workload generator.
+#
+# Draws reproducible process sets of any size from a seed, with NumPy doing
+# the sampling for all processes at once, so a million processes take well
+# under a second. The result is a ProcessTable ready for the simulator, or a
+# CSV/JSONL trace for traces.py and sweep.py:
+#
+#     from workload import generate
+#     processes = generate(10**6, arrivals="bursty", bursts="pareto", seed=7)
+#
+#     python workload.py 1000000 --bursts lognormal --seed 7 --output jobs.csv
+#
+# Arrivals are Poisson, bursty (alternating busy and quiet spells of Poisson
+# arrivals) or a single batch at time 0; Poisson and bursty arrivals are
+# spaced for the given CPU load. Bursts are uniform, exponential, Pareto or
+# log-normal with mean MEAN_BURST. Priorities are uniform over 0-9 unless a
+# {priority: weight} mix is given.
+from array import array
+import argparse
+import sys
+
+import numpy as np
+
+from process_table import INPUT_COLUMNS, TYPECODE, ProcessTable
+
+ARRIVALS = ("poisson", "bursty", "batch")
+BURSTS = ("uniform", "exponential", "pareto", "lognormal")
+
+# Mean burst length, and the CPU load the arrival rate is tuned for
+MEAN_BURST = 10
+LOAD = 0.9
+
+# Bursty arrivals: mean number of arrivals per spell, and how much faster
+# arrivals come during a busy spell than on average
+SPELL_LENGTH = 50
+BUSY_SPEEDUP = 4
+
+# Pareto shape (its mean is SHAPE / (SHAPE - 1) times the minimum) and
+# log-normal sigma
+PARETO_SHAPE = 1.5
+LOGNORMAL_SIGMA = 1.0
+
+
+def generate(size, arrivals="poisson", bursts="exponential", priorities=None, seed=0,
+             load=LOAD, mean_burst=MEAN_BURST):
+    # Return a ProcessTable of size processes with PIDs 1..size
+    if arrivals not in ARRIVALS:
+        raise ValueError(f"Unknown arrival pattern: {arrivals}")
+    if bursts not in BURSTS:
+        raise ValueError(f"Unknown burst distribution: {bursts}")
+    if size < 0:
+        raise ValueError("Workload size must not be negative")
+
+    rng = np.random.default_rng(seed)
+    arrival = arrival_times(rng, size, arrivals, mean_burst / load)
+    burst = burst_times(rng, size, bursts, mean_burst)
+    priority = priority_values(rng, size, priorities)
+    return to_table(np.arange(1, size + 1), arrival, burst, priority)
+
+
+def arrival_times(rng, size, pattern, mean_gap):
+    if pattern == "batch":
+        return np.zeros(size, dtype=np.int64)
+    gaps = rng.exponential(mean_gap, size)
+    if pattern == "bursty":
+        # Spells alternate busy/quiet; both average the same number of
+        # arrivals, so the quiet gap is chosen to keep the overall mean
+        runs = rng.geometric(1 / SPELL_LENGTH, 2 * (size // SPELL_LENGTH) + 2)
+        while runs.sum() < size:
+            runs = np.concatenate([runs, rng.geometric(1 / SPELL_LENGTH, len(runs))])
+        busy = np.repeat(np.arange(len(runs)) % 2 == 0, runs)[:size]
+        gaps *= np.where(busy, 1 / BUSY_SPEEDUP, 2 - 1 / BUSY_SPEEDUP)
+    return np.cumsum(gaps).astype(np.int64)
+
+
+def burst_times(rng, size, distribution, mean):
+    if distribution == "uniform":
+        values = rng.uniform(1, 2 * mean - 1, size)
+    elif distribution == "exponential":
+        values = rng.exponential(mean, size)
+    elif distribution == "pareto":
+        minimum = mean * (PARETO_SHAPE - 1) / PARETO_SHAPE
+        values = (rng.pareto(PARETO_SHAPE, size) + 1) * minimum
+    else:
+        mu = np.log(mean) - LOGNORMAL_SIGMA ** 2 / 2
+        values = rng.lognormal(mu, LOGNORMAL_SIGMA, size)
+    return np.maximum(np.rint(values), 1).astype(np.int64)
+
+
+def priority_values(rng, size, mix):
+    if mix is None:
+        return rng.integers(0, 10, size)
+    levels = np.array(list(mix), dtype=np.int64)
+    weights = np.array(list(mix.values()), dtype=float)
+    return rng.choice(levels, size, p=weights / weights.sum())
+
+
+def to_table(pid, arrival, burst, priority):
+    # Build a ProcessTable straight from int64 arrays
+    table = ProcessTable()
+    for column, values in zip(INPUT_COLUMNS, (pid, arrival, burst, priority)):
+        values_array = array(TYPECODE)
+        values_array.frombytes(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+        setattr(table, column, values_array)
+    table.reset()
+    return table
+
+
+def write_trace(table, path, chunk=100000):
+    # Save the input columns as a .csv or .jsonl/.ndjson trace
+    if path.endswith(".csv"):
+        header, line = "pid,arrival,burst,priority\n", "{},{},{},{}\n"
+    elif path.endswith((".jsonl", ".ndjson")):
+        header, line = "", '{{"pid": {}, "arrival": {}, "burst": {}, "priority": {}}}\n'
+    else:
+        raise ValueError(f"Unsupported trace format: {path}")
+    columns = [getattr(table, column) for column in INPUT_COLUMNS]
+    with open(path, "w") as f:
+        f.write(header)
+        for start in range(0, len(table), chunk):
+            rows = zip(*(values[start:start + chunk] for values in columns))
+            f.write("".join(line.format(*row) for row in rows))
+
+
+def parse_mix(text):
+    # "0:1,5:6,9:3" -> {0: 1.0, 5: 6.0, 9: 3.0}
+    mix = {}
+    for part in text.split(","):
+        priority, weight = part.split(":")
+        mix[int(priority)] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic scheduling workload")
+    parser.add_argument("size", type=int, help="number of processes")
+    parser.add_argument("--arrivals", default="poisson", choices=ARRIVALS)
+    parser.add_argument("--bursts", default="exponential", choices=BURSTS)
+    parser.add_argument("--priorities", type=parse_mix,
+                        help="priority:weight pairs, e.g. 0:1,5:6,9:3 (default: uniform 0-9)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load", type=float, default=LOAD)
+    parser.add_argument("--mean-burst", type=float, default=MEAN_BURST)
+    parser.add_argument("--output", required=True, help="trace file (.csv or .jsonl)")
+    args = parser.parse_args(argv)
+
+    table = generate(args.size, args.arrivals, args.bursts, args.priorities, args.seed,
+                     args.load, args.mean_burst)
+    write_trace(table, args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())